@@ -203,27 +203,18 @@ const Dashboard = ({ isDarkMode }) => {
         setIsLoading(true);
         setError(null);
         
-        const [portfolioResponse, wishlistResponse] = await Promise.all([
-          fetch("http://localhost:8000/profile", {
-            headers: {
-              Authorization: `Bearer ${localStorage.getItem("access_token")}`,
-            },
-          }),
-          fetch("http://localhost:8000/watchlist", {
-            headers: {
-              Authorization: `Bearer ${localStorage.getItem("access_token")}`,
-            },
-          })
-        ]);
-
-        if (!portfolioResponse.ok || !wishlistResponse.ok) {
+        // One request for both sections; the browser revalidates it with the ETag
+        const response = await fetch("http://localhost:8000/dashboard?fields=profile,watchlist", {
+          headers: {
+            Authorization: `Bearer ${localStorage.getItem("access_token")}`,
+          },
+        });
+
+        if (!response.ok) {
           throw new Error("Failed to fetch data");
         }
 
-        const [portfolioData, wishlistData] = await Promise.all([
-          portfolioResponse.json(),
-          wishlistResponse.json()
-        ]);
+        const { profile: portfolioData, watchlist: wishlistData } = await response.json();
 
         // Use fallback data if no data is available
         setPortfolioData(portfolioData?.investments?.length > 0 ? portfolioData : fallbackPortfolioData);
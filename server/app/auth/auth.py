@@ -1,49 +1,142 @@
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from app.db.connect import users_collection
-from app.auth.jwt_handler import create_access_token, decode_access_token
-from passlib.context import CryptContext
+from pymongo.errors import DuplicateKeyError
+from app.db.repository import users
+from app.auth.jwt_handler import ACCESS_TOKEN_EXPIRE_MINUTES, create_access_token, decode_access_token
+from app.auth.passwords import hash_async, verify_async
+from app.auth.sessions import InvalidRefreshToken, sessions
+from app.core.lru import LRUCache
+from app.ml.executor import PoolSaturated
+from app.schemas.models import RefreshRequest
+from app import config
+import time
 
 auth_router = APIRouter()
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="login")
 
-def get_user(email: str):
-    return users_collection.find_one({"email": email})
+# Verified tokens -> email, and recently loaded user documents keyed by ("email"|"username", value).
+# Entries are short-lived and every write path calls invalidate_user().
+principal_cache = LRUCache(max_entries=config.AUTH_CACHE_MAX_ENTRIES, ttl=config.AUTH_CACHE_TTL)
+user_cache = LRUCache(max_entries=config.AUTH_CACHE_MAX_ENTRIES, ttl=config.AUTH_CACHE_TTL)
+
+
+# Cached documents leave out the password hash and the unbounded assets array;
+# login and GET /assets run their own projected queries for those.
+USER_PROJECTION = {"password": 0, "assets": 0}
+
+async def _find_user(field: str, value: str):
+    key = (field, value)
+    user = user_cache.get(key)
+    if user is None:
+        user = await users.find_by(field, value, USER_PROJECTION)
+        # Only existing users are cached, so a fresh signup is never hidden by a stale miss
+        if user is not None:
+            user_cache.set(key, user)
+    return user
+
+async def get_user(email: str):
+    return await _find_user("email", email)
+
+async def load_user(username: str):
+    """User document by username, served from the auth cache when it was just loaded."""
+    return await _find_user("username", username)
+
+def invalidate_user(email: str):
+    # Signup stores email as the username, so both keys point at the same document
+    user_cache.pop(("email", email))
+    user_cache.pop(("username", email))
+
+def auth_cache_stats():
+    return {"principals": principal_cache.stats(), "users": user_cache.stats()}
+
+def busy(e: PoolSaturated):
+    return HTTPException(
+        status_code=503,
+        detail="Too many sign-ins in progress, please retry shortly",
+        headers={"Retry-After": str(e.retry_after)},
+    )
+
+def issue_tokens(email: str, refresh_token: str):
+    return {
+        "access_token": create_access_token({"sub": email}),
+        "token_type": "bearer",
+        "expires_in": ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+        "refresh_token": refresh_token,
+    }
 
 @auth_router.post("/signup")
-def signup(email: str, password: str):
+async def signup(email: str, password: str):
     # Check if a user with the given email already exists
-    if get_user(email):
+    if await get_user(email):
         raise HTTPException(status_code=400, detail="User already exists")
     
-    # Hash the password
-    hashed_password = pwd_context.hash(password)
+    invalidate_user(email)
+
+    # Hash the password on the bounded password pool (CPU-bound, so off the event loop)
+    try:
+        hashed_password = await hash_async(password)
+    except PoolSaturated as e:
+        raise busy(e)
     
     # Insert a single document with both email and username fields
-    users_collection.insert_one({
-        "email": email,
-        "username": email,  # Use email as the username
-        "password": hashed_password,
-        "profile": {},      # Initialize profile as an empty object
-        "assets": [],       # Initialize assets as an empty list
-        "watchlist": {},    # Initialize watchlist as an empty object
-        "settings": {}      # Initialize settings as an empty object
-    })
+    try:
+        await users.create({
+            "email": email,
+            "username": email,  # Use email as the username
+            "password": hashed_password,
+            "profile": {},      # Initialize profile as an empty object
+            "assets": [],       # Initialize assets as an empty list
+            "watchlist": {},    # Initialize watchlist as an empty object
+            "settings": {}      # Initialize settings as an empty object
+        })
+    except DuplicateKeyError:
+        # A concurrent signup for the same email won the race to the unique index
+        raise HTTPException(status_code=400, detail="User already exists")
     return {"message": "User created successfully"}
 
 @auth_router.post("/login")
-def login(form_data: OAuth2PasswordRequestForm = Depends()):
-    user = get_user(form_data.username)
-    if not user or not pwd_context.verify(form_data.password, user["password"]):
-        raise HTTPException(status_code=401, detail="Invalid credentials")
-    
-    token = create_access_token({"sub": user["email"]})
-    return {"access_token": token, "token_type": "bearer"}
+async def login(form_data: OAuth2PasswordRequestForm = Depends()):
+    user = await users.find_by_email(form_data.username, {"email": 1, "password": 1})
+    try:
+        if not user or not await verify_async(form_data.password, user["password"]):
+            raise HTTPException(status_code=401, detail="Invalid credentials")
+    except PoolSaturated as e:
+        raise busy(e)
+
+    # The refresh token renews access without another bcrypt verify
+    return issue_tokens(user["email"], await sessions.create(user["email"]))
+
+@auth_router.post("/refresh")
+async def refresh(body: RefreshRequest):
+    try:
+        email, refresh_token = await sessions.rotate(body.refresh_token)
+    except InvalidRefreshToken:
+        raise HTTPException(status_code=401, detail="Invalid refresh token")
+    return issue_tokens(email, refresh_token)
+
+@auth_router.post("/logout")
+async def logout(body: RefreshRequest):
+    # Ends the refresh session; access tokens already issued stay valid until they expire
+    try:
+        await sessions.revoke(body.refresh_token)
+    except InvalidRefreshToken:
+        raise HTTPException(status_code=401, detail="Invalid refresh token")
+    return {"message": "Logged out"}
+
+async def get_current_user(token: str = Depends(oauth2_scheme)):
+    email = principal_cache.get(token)
+    if email is not None:
+        return email
 
-def get_current_user(token: str = Depends(oauth2_scheme)):
     payload = decode_access_token(token)
-    if not payload or not get_user(payload.get("sub")):
+    if not payload or not await get_user(payload.get("sub")):
         raise HTTPException(status_code=401, detail="Invalid credentials")
+    # Never cache a principal past its token's own expiry
+    expires_at = min(time.time() + config.AUTH_CACHE_TTL, payload.get("exp", 0))
+    principal_cache.set(token, payload.get("sub"), expires_at=expires_at)
     return payload.get("sub")
+
+@auth_router.get("/auth/cache")
+def auth_cache():
+    return auth_cache_stats()
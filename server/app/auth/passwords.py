@@ -0,0 +1,51 @@
+import asyncio
+from app import config
+from app.ml.executor import InferencePool
+
+# bcrypt costs tens of ms of CPU per call, so it runs on its own small pool
+# instead of Starlette's shared threadpool; a login burst queues here and is
+# shed with PoolSaturated once `max_pending` jobs are waiting.
+_context = None
+
+
+def _crypt_context():
+    global _context
+    if _context is None:
+        from passlib.context import CryptContext
+        _context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+    return _context
+
+
+# Module-level so process-pool workers can unpickle them
+def warm_worker():
+    _crypt_context()
+
+
+def hash_password(password):
+    return _crypt_context().hash(password)
+
+
+def verify_password(password, hashed):
+    return _crypt_context().verify(password, hashed)
+
+
+password_pool = InferencePool(
+    kind=config.PASSWORD_EXECUTOR,
+    max_workers=config.PASSWORD_WORKERS,
+    max_pending=config.PASSWORD_MAX_PENDING,
+    retry_after=config.PASSWORD_RETRY_AFTER,
+    initializer=warm_worker if config.PASSWORD_EXECUTOR == "process" else None,
+)
+
+
+async def hash_async(password):
+    return await password_pool.run(hash_password, password)
+
+
+async def verify_async(password, hashed):
+    return await password_pool.run(verify_password, password, hashed)
+
+
+async def warm_pool():
+    """Start the workers ahead of the first login instead of on it."""
+    await asyncio.gather(*(password_pool.run(warm_worker) for _ in range(password_pool.max_workers)))
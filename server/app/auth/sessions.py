@@ -0,0 +1,90 @@
+import hashlib
+import hmac
+import secrets
+from datetime import datetime, timedelta
+from app import config
+from app.auth.jwt_handler import SECRET_KEY
+from app.core.metrics import DB_OPERATION_SECONDS
+from app.db.connect import sessions_collection
+from app.db.indexes import SESSION_INDEXES, ensure_indexes
+
+
+class InvalidRefreshToken(Exception):
+    pass
+
+
+def _digest(secret):
+    # Only an HMAC of the secret is stored, so a leaked sessions collection cannot mint tokens
+    return hmac.new(SECRET_KEY.encode(), secret.encode(), hashlib.sha256).hexdigest()
+
+
+class SessionStore:
+    """Refresh-token sessions: one document per login, rotated on every refresh.
+
+    A refresh token is "<session id>.<secret>". Renewing it costs one indexed
+    read, an HMAC and one conditional write, instead of a bcrypt verify. Each
+    refresh issues a new secret; presenting an already-rotated secret revokes the
+    whole session, since it means the token was copied.
+    """
+
+    def __init__(self, collection, lifetime_days=config.REFRESH_TOKEN_EXPIRE_DAYS):
+        self.collection = collection
+        self.lifetime = timedelta(days=lifetime_days)
+
+    async def create(self, email):
+        session_id, secret = secrets.token_urlsafe(16), secrets.token_urlsafe(32)
+        now = datetime.utcnow()
+        with DB_OPERATION_SECONDS.time(operation="sessions.insert_one"):
+            await self.collection.insert_one({
+                "_id": session_id,
+                "email": email,
+                "token_hash": _digest(secret),
+                "created_at": now,
+                "expires_at": now + self.lifetime,  # absolute: refreshing does not extend it
+                "revoked": False,
+            })
+        return f"{session_id}.{secret}"
+
+    async def _find(self, refresh_token):
+        session_id, _, secret = refresh_token.partition(".")
+        if not session_id or not secret:
+            raise InvalidRefreshToken()
+        with DB_OPERATION_SECONDS.time(operation="sessions.find_one"):
+            session = await self.collection.find_one({"_id": session_id})
+        if session is None or session["revoked"] or session["expires_at"] <= datetime.utcnow():
+            raise InvalidRefreshToken()
+        return session, secret
+
+    async def rotate(self, refresh_token):
+        """Exchange a refresh token for (email, new refresh token), or raise InvalidRefreshToken."""
+        session, secret = await self._find(refresh_token)
+        if not hmac.compare_digest(session["token_hash"], _digest(secret)):
+            await self._revoke(session["_id"])
+            raise InvalidRefreshToken()
+
+        new_secret = secrets.token_urlsafe(32)
+        # Conditional on the old hash, so two concurrent refreshes cannot both succeed
+        with DB_OPERATION_SECONDS.time(operation="sessions.update_one"):
+            result = await self.collection.update_one(
+                {"_id": session["_id"], "token_hash": session["token_hash"], "revoked": False},
+                {"$set": {"token_hash": _digest(new_secret)}},
+            )
+        if result.matched_count != 1:
+            raise InvalidRefreshToken()
+        return session["email"], f"{session['_id']}.{new_secret}"
+
+    async def revoke(self, refresh_token):
+        session, secret = await self._find(refresh_token)
+        if not hmac.compare_digest(session["token_hash"], _digest(secret)):
+            raise InvalidRefreshToken()
+        await self._revoke(session["_id"])
+
+    async def _revoke(self, session_id):
+        with DB_OPERATION_SECONDS.time(operation="sessions.update_one"):
+            await self.collection.update_one({"_id": session_id}, {"$set": {"revoked": True}})
+
+    async def ensure_indexes(self, indexes=SESSION_INDEXES):
+        return await ensure_indexes(self.collection, indexes)
+
+
+sessions = SessionStore(sessions_collection)
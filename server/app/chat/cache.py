@@ -0,0 +1,126 @@
+import asyncio
+import hashlib
+import re
+import sqlite3
+import time
+from app.core.lru import LRUCache
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Case-, whitespace- and trailing-punctuation-insensitive form of a prompt."""
+    return _WHITESPACE.sub(" ", prompt).strip().lower().rstrip("?!. ")
+
+
+class _DiskTier:
+    """SQLite-backed second tier so cached answers survive restarts."""
+
+    def __init__(self, path):
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, response TEXT, expires_at REAL)"
+        )
+        self._db.commit()
+        self._lock = asyncio.Lock()
+
+    def _get(self, key):
+        row = self._db.execute(
+            "SELECT response, expires_at FROM responses WHERE key = ? AND expires_at > ?", (key, time.time())
+        ).fetchone()
+        return row
+
+    def _put(self, key, response, expires_at):
+        self._db.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?)", (key, response, expires_at))
+        self._db.execute("DELETE FROM responses WHERE expires_at <= ?", (time.time(),))
+        self._db.commit()
+
+    async def get(self, key):
+        async with self._lock:
+            return await asyncio.to_thread(self._get, key)
+
+    async def put(self, key, response, expires_at):
+        async with self._lock:
+            await asyncio.to_thread(self._put, key, response, expires_at)
+
+
+class ChatResponseCache:
+    """LLM answers keyed on the normalized prompt, the system-prompt hash and the model.
+
+    Memory tier is a byte-bounded LRU with TTL; an optional SQLite tier keeps
+    answers across restarts. Concurrent identical misses share one upstream call.
+    """
+
+    def __init__(self, system_prompt, model, max_bytes=16 * 1024 * 1024, ttl=3600, persist_path=None):
+        self.ttl = ttl
+        self._namespace = hashlib.blake2b(
+            f"{model}\0{system_prompt}".encode(), digest_size=8
+        ).hexdigest()
+        self._memory = LRUCache(max_bytes=max_bytes, ttl=ttl, sizeof=lambda k, v: len(k) + 2 * len(v) + 64)
+        self._disk = _DiskTier(persist_path) if persist_path else None
+        self._in_flight = {}
+        self.upstream_calls = 0
+        self.disk_hits = 0
+        self.coalesced = 0
+
+    def key(self, prompt):
+        digest = hashlib.blake2b(normalize_prompt(prompt).encode(), digest_size=16).hexdigest()
+        return f"{self._namespace}:{digest}"
+
+    async def lookup(self, key):
+        response = self._memory.get(key)
+        if response is None and self._disk is not None:
+            row = await self._disk.get(key)
+            if row is not None:
+                response, expires_at = row
+                self.disk_hits += 1
+                self._memory.set(key, response, expires_at=expires_at)
+        return response
+
+    async def store(self, key, response):
+        expires_at = time.time() + self.ttl
+        self._memory.set(key, response, expires_at=expires_at)
+        if self._disk is not None:
+            await self._disk.put(key, response, expires_at)
+
+    async def get_or_call(self, prompt, call):
+        """Cached answer for `prompt`, or the result of `await call()` (shared by concurrent misses)."""
+        key = self.key(prompt)
+        response = await self.lookup(key)
+        if response is not None:
+            return response
+
+        task = self._in_flight.get(key)
+        if task is None:
+            # The upstream call is its own task, so one caller disconnecting does not fail the others
+            task = asyncio.ensure_future(self._fetch(key, call))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda t: self._finish(key, t))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    async def _fetch(self, key, call):
+        self.upstream_calls += 1
+        response = await call()
+        await self.store(key, response)
+        return response
+
+    def _finish(self, key, task):
+        self._in_flight.pop(key, None)
+        # Retrieve the outcome so a failure nobody awaited any more is not logged as unhandled
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self):
+        memory = self._memory.stats()
+        served = memory["hits"] + self.disk_hits + self.coalesced
+        requests = served + self.upstream_calls
+        return {
+            "memory": memory,
+            "disk_hits": self.disk_hits,
+            "coalesced": self.coalesced,
+            "upstream_calls": self.upstream_calls,
+            "upstream_calls_saved": served,
+            "hit_ratio": served / requests if requests else 0.0,
+        }
@@ -0,0 +1,84 @@
+import asyncio
+from app import config
+
+
+class LLMUnavailable(RuntimeError):
+    """The configured backend cannot be built (e.g. missing credentials)."""
+
+
+def backend_error(name=None):
+    """Why the configured backend cannot serve requests, or None if it can."""
+    name = name or config.LLM_BACKEND
+    if name == "gemini" and not config.GEMINI_API_KEY:
+        return "GEMINI_API_KEY is not set (set it, or use LLM_BACKEND=fake for the local stub)"
+    return None
+
+
+class GeminiBackend:
+    """Async Gemini client: one-shot and token-streaming generation."""
+
+    def __init__(self, api_key, model):
+        from google import genai
+        self.client = genai.Client(api_key=api_key)
+        self.model = model
+
+    async def generate(self, prompt):
+        response = await self.client.aio.models.generate_content(model=self.model, contents=prompt)
+        return response.text
+
+    async def stream(self, prompt):
+        chunks = await self.client.aio.models.generate_content_stream(model=self.model, contents=prompt)
+        async for chunk in chunks:
+            if chunk.text:
+                yield chunk.text
+
+
+class FakeLLM:
+    """Network-free stand-in for tests and load benchmarks.
+
+    Replies with a fixed preamble plus the last line of the prompt, one word
+    per chunk, sleeping `token_delay` seconds between chunks to mimic decoding.
+    """
+
+    model = "fake-llm"
+
+    def __init__(self, token_delay=0.0, first_token_delay=0.0):
+        self.token_delay = token_delay
+        self.first_token_delay = first_token_delay
+
+    def _words(self, prompt):
+        question = prompt.strip().splitlines()[-1] if prompt.strip() else ""
+        return f"StonkGuru Analysis: Investment involves risk. You asked: {question}".split(" ")
+
+    async def generate(self, prompt):
+        words = self._words(prompt)
+        await asyncio.sleep(self.first_token_delay + self.token_delay * len(words))
+        return " ".join(words)
+
+    async def stream(self, prompt):
+        await asyncio.sleep(self.first_token_delay)
+        for i, word in enumerate(self._words(prompt)):
+            yield word if i == 0 else " " + word
+            await asyncio.sleep(self.token_delay)
+
+
+def create_backend(name=None):
+    name = name or config.LLM_BACKEND
+    error = backend_error(name)
+    if error is not None:
+        raise LLMUnavailable(error)
+    if name == "gemini":
+        return GeminiBackend(config.GEMINI_API_KEY, config.GEMINI_MODEL)
+    if name == "fake":
+        return FakeLLM(token_delay=config.FAKE_LLM_TOKEN_DELAY_MS / 1000.0)
+    raise ValueError(f"Unknown LLM backend: {name!r}")
+
+
+def backend_model(name=None):
+    """Model identifier of a backend, known without building its client."""
+    name = name or config.LLM_BACKEND
+    if name == "gemini":
+        return config.GEMINI_MODEL
+    if name == "fake":
+        return FakeLLM.model
+    raise ValueError(f"Unknown LLM backend: {name!r}")
@@ -0,0 +1,117 @@
+import re
+from typing import NamedTuple, Optional
+
+MAX_LENGTH = 200
+
+# Keyword denylist / stock-specific allowlist (case-insensitive substrings)
+PROHIBITED_TERMS = ["crypto", "nft", "personal", "hypothetical"]
+STOCK_KEYWORDS = ["stock", "share", "nyse", "nasdaq", "dividend"]
+
+# Programming syntax blocklist (Python, JS, C/C++, Java, etc.)
+PROGRAMMING_PATTERNS = [
+    r"\bdef\b", r"\bclass\b", r"\bimport\b", r"\bfunction\b", r"\bconsole\.log\b",
+    r"\bvar\b", r"\blet\b", r"\bconst\b", r"\bif\s*\(", r"\bwhile\s*\(",
+    r"\bfor\s*\(", r"try\s*{", r"catch\s*\(", r"#include\s*<", r"\bpublic\b",
+    r"\bprivate\b", r"\bstatic\b", r"\bSystem\.out\.println\b", r"<script.*?>",
+    r"{.*?}", r"\[.*?\]", r"\(.*?\)", r"==|!=|>=|<=|=>|<-|->|::",  # common logic/syntax
+]
+
+# Injection/XSS patterns
+INJECTION_PATTERNS = [
+    r"(?:--|\|\||;)",  # SQL chaining
+    r"(?:select|drop|insert|delete|update|union)",  # SQL keywords
+    r"(?:\bOR\b|\bAND\b).+=.",  # conditional logic
+    r"<[^>]+>",  # HTML tags
+    r"(?:\$\{.+\})",  # Template injections
+]
+
+# The deny regexes above cannot match unless the prompt contains one of these
+# words or characters (for ASCII text), so clean prompts skip them entirely
+DENY_TRIGGER_WORDS = [
+    "def", "class", "import", "function", "console", "var", "let", "const", "public", "private",
+    "static", "system", "select", "drop", "insert", "delete", "update", "union",
+]
+DENY_TRIGGER_CHARS = frozenset("([{<=-:|;#$")
+
+# External links are only allowed to stock/company/news sources
+LINK_MARKERS = ["http", "www."]
+ALLOWED_DOMAINS = ["bloomberg", "reuters", "yahoo finance", "marketwatch", "moneycontrol", "investopedia"]
+
+
+class ValidationResult(NamedTuple):
+    ok: bool
+    rule: Optional[str] = None   # which rule rejected the prompt
+    match: Optional[str] = None  # the text that triggered it
+
+    def __bool__(self):
+        return self.ok
+
+
+class PromptValidator:
+    """All /chat allow/deny rules compiled once and applied in a single pass per rule family.
+
+    Keywords are found with one zero-width lookahead alternation over the
+    lower-cased prompt, which reports every (possibly overlapping) occurrence
+    like a small Aho-Corasick automaton; the same scan spots the trigger words
+    without which no syntax/injection regex can match. Those regexes are joined
+    into one named-group alternation, so `match.lastgroup` names the rule.
+    Decisions are identical to checking each list in turn.
+    """
+
+    def __init__(self):
+        self._keyword_kind = {}
+        for kind, words in (("deny_term", PROHIBITED_TERMS), ("stock_keyword", STOCK_KEYWORDS),
+                            ("link", LINK_MARKERS), ("allowed_domain", ALLOWED_DOMAINS),
+                            ("deny_trigger", DENY_TRIGGER_WORDS)):
+            for word in words:
+                self._keyword_kind[word] = kind
+        # No keyword is a prefix of another, so one alternative per start position is enough
+        keywords = sorted(self._keyword_kind, key=len, reverse=True)
+        self._keywords = re.compile("(?=(" + "|".join(map(re.escape, keywords)) + "))")
+
+        self._rule_names = {}
+        groups = []
+        for family, patterns in (("programming", PROGRAMMING_PATTERNS), ("injection", INJECTION_PATTERNS)):
+            for i, pattern in enumerate(patterns):
+                name = f"{family}_{i}"
+                self._rule_names[name] = f"{family}:{pattern}"
+                groups.append(f"(?P<{name}>{pattern})")
+        self._deny = re.compile("|".join(groups), re.IGNORECASE)
+
+    def validate(self, query: str) -> ValidationResult:
+        # Length check
+        if len(query) > MAX_LENGTH:
+            return ValidationResult(False, "length")
+
+        found = {}
+        for m in self._keywords.finditer(query.lower()):
+            found.setdefault(self._keyword_kind[m.group(1)], m.group(1))
+
+        if "deny_term" in found:
+            return ValidationResult(False, "deny_term", found["deny_term"])
+        if "stock_keyword" not in found:
+            return ValidationResult(False, "no_stock_keyword")
+
+        # Non-ASCII text always takes the full scan: IGNORECASE folds a few characters lower() does not
+        if "deny_trigger" in found or not DENY_TRIGGER_CHARS.isdisjoint(query) or not query.isascii():
+            m = self._deny.search(query)
+            if m:
+                return ValidationResult(False, self._rule_names[m.lastgroup], m.group(m.lastgroup))
+
+        if "link" in found and "allowed_domain" not in found:
+            return ValidationResult(False, "link_domain", found["link"])
+        return ValidationResult(True)
+
+    def validate_batch(self, queries):
+        return [self.validate(query) for query in queries]
+
+
+validator = PromptValidator()
+
+
+def validate_input(query: str) -> bool:
+    return validator.validate(query).ok
+
+
+def validate_batch(queries):
+    return validator.validate_batch(queries)
@@ -0,0 +1,95 @@
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+def _flag(name: str, default: str = "0") -> bool:
+    return os.getenv(name, default).strip().lower() in ("1", "true", "yes", "on")
+
+
+# Cross-request micro-batching of rollout steps
+INFERENCE_BATCHING = _flag("INFERENCE_BATCHING", "1")
+BATCH_MAX_SIZE = int(os.getenv("BATCH_MAX_SIZE", "64"))
+BATCH_MAX_WAIT_MS = float(os.getenv("BATCH_MAX_WAIT_MS", "2"))
+
+# Dedicated inference executor ("thread" or "process") and its admission limit
+INFERENCE_EXECUTOR = os.getenv("INFERENCE_EXECUTOR", "thread")
+INFERENCE_WORKERS = int(os.getenv("INFERENCE_WORKERS", "2"))
+INFERENCE_MAX_PENDING = int(os.getenv("INFERENCE_MAX_PENDING", "32"))
+INFERENCE_RETRY_AFTER = int(os.getenv("INFERENCE_RETRY_AFTER", "1"))
+
+# Market dataset used for the `previous` series and server-side windows
+MARKET_DATA_PATH = os.getenv("MARKET_DATA_PATH", "data/latest_dataset.csv")
+
+# Forecast cache (FORECAST_CACHE_PATH enables persistence across restarts)
+FORECAST_CACHE_MAX_BYTES = int(os.getenv("FORECAST_CACHE_MAX_BYTES", str(8 * 1024 * 1024)))
+FORECAST_CACHE_TTL = float(os.getenv("FORECAST_CACHE_TTL", "3600"))
+FORECAST_CACHE_PATH = os.getenv("FORECAST_CACHE_PATH") or None
+
+# LSTM feature backend: "keras" (TensorFlow) or "numpy" (exported weights, no TF import)
+INFERENCE_BACKEND = os.getenv("INFERENCE_BACKEND", "keras")
+
+
+def _datasets(spec):
+    # "AAPL=data/aapl.csv,MSFT=data/msft.csv" -> {"AAPL": "data/aapl.csv", ...}
+    pairs = (item.split("=", 1) for item in spec.split(",") if "=" in item)
+    return {symbol.strip().upper(): path.strip() for symbol, path in pairs}
+
+
+# Symbol -> dataset served by symbol-mode /predict_stock; defaults to the single bundled dataset
+MARKET_DATA_SYMBOL = os.getenv("MARKET_DATA_SYMBOL", "DEFAULT").upper()
+MARKET_DATASETS = _datasets(os.getenv("MARKET_DATASETS", "")) or {MARKET_DATA_SYMBOL: MARKET_DATA_PATH}
+
+# Output of `python -m app.ml.materialize`, served read-through by /predict_stock and /graph
+FORECAST_STORE_DIR = os.getenv("FORECAST_STORE_DIR", "data/forecasts")
+
+# POST /ingest/{symbol}: shared secret expected in X-Ingest-Token (unset = endpoint disabled), rows per append
+INGEST_TOKEN = os.getenv("INGEST_TOKEN", "")
+INGEST_BATCH_SIZE = int(os.getenv("INGEST_BATCH_SIZE", "500"))
+
+# Upper bound on Monte Carlo scenarios per /predict_stock request
+SCENARIO_MAX = int(os.getenv("SCENARIO_MAX", "500"))
+
+# Cache of verified tokens and recently loaded user documents (seconds / entries)
+AUTH_CACHE_TTL = float(os.getenv("AUTH_CACHE_TTL", "60"))
+AUTH_CACHE_MAX_ENTRIES = int(os.getenv("AUTH_CACHE_MAX_ENTRIES", "10000"))
+
+# MongoDB: "mongo" (Motor, async) or "memory" (in-process stand-in for tests and load benchmarks)
+MONGO_BACKEND = os.getenv("MONGO_BACKEND", "mongo")
+MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", "100"))
+MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", "0"))
+MONGO_TIMEOUT_MS = int(os.getenv("MONGO_TIMEOUT_MS", "5000"))
+MONGO_READ_RETRIES = int(os.getenv("MONGO_READ_RETRIES", "2"))
+MONGO_RETRY_BACKOFF_MS = float(os.getenv("MONGO_RETRY_BACKOFF_MS", "50"))
+
+# Chat LLM backend: "gemini" or "fake" (local stub, no network)
+LLM_BACKEND = os.getenv("LLM_BACKEND", "gemini")
+GEMINI_API_KEY = os.getenv("GEMINI_API_KEY", "")  # required when LLM_BACKEND=gemini
+GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-2.0-flash")
+LLM_TIMEOUT_S = float(os.getenv("LLM_TIMEOUT_S", "30"))
+FAKE_LLM_TOKEN_DELAY_MS = float(os.getenv("FAKE_LLM_TOKEN_DELAY_MS", "0"))
+
+# /chat response cache (CHAT_CACHE_PATH enables the SQLite tier)
+CHAT_CACHE_MAX_BYTES = int(os.getenv("CHAT_CACHE_MAX_BYTES", str(16 * 1024 * 1024)))
+CHAT_CACHE_TTL = float(os.getenv("CHAT_CACHE_TTL", "3600"))
+CHAT_CACHE_PATH = os.getenv("CHAT_CACHE_PATH") or None
+
+# Sampling profiler: dump collapsed stacks for requests slower than PROFILE_SLOW_MS (0 = off)
+PROFILE_SLOW_MS = float(os.getenv("PROFILE_SLOW_MS", "0"))
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "5"))
+PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+
+# Password hashing pool: "process" (default) or "thread", with a bounded backlog
+PASSWORD_EXECUTOR = os.getenv("PASSWORD_EXECUTOR", "process")
+PASSWORD_WORKERS = int(os.getenv("PASSWORD_WORKERS", "2"))
+PASSWORD_MAX_PENDING = int(os.getenv("PASSWORD_MAX_PENDING", "16"))
+PASSWORD_RETRY_AFTER = int(os.getenv("PASSWORD_RETRY_AFTER", "1"))
+
+# Refresh-token sessions (days until a login must be repeated)
+REFRESH_TOKEN_EXPIRE_DAYS = float(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "14"))
+
+# Response compression for forecast and graph payloads
+COMPRESS_MIN_BYTES = int(os.getenv("COMPRESS_MIN_BYTES", "1024"))
+GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", "5"))
+BROTLI_QUALITY = int(os.getenv("BROTLI_QUALITY", "4"))
@@ -0,0 +1,172 @@
+import gzip
+import json
+import struct
+import numpy as np
+from fastapi import HTTPException, Response
+from app import config
+
+# Optional fast paths: orjson for JSON, msgpack for the binary map format, brotli for "br"
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+JSON = "application/json"
+COLUMNAR = "application/vnd.stockai.columnar+json"
+MSGPACK = "application/msgpack"
+FLOAT32 = "application/vnd.stockai.float32"
+
+# ?format= shortcuts for clients that cannot set Accept (e.g. a plain link)
+FORMATS = {"json": JSON, "columnar": COLUMNAR, "msgpack": MSGPACK, "float32": FLOAT32}
+MEDIA_TYPES = {JSON: JSON, COLUMNAR: COLUMNAR, MSGPACK: MSGPACK, "application/x-msgpack": MSGPACK, FLOAT32: FLOAT32}
+
+
+def _plain(value):
+    """ndarrays -> lists, recursively, for encoders without native NumPy support."""
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, dict):
+        return {k: _plain(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_plain(v) for v in value]
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def _numpy_default(value):
+    # orjson only serializes exact ndarrays; memmap columns (warm-started snapshots) become plain views
+    if isinstance(value, np.ndarray):
+        return np.asarray(value)
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dumps(payload):
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY, default=_numpy_default)
+    return json.dumps(_plain(payload), separators=(",", ":")).encode()
+
+
+def pack_float32(payload):
+    """Numeric arrays as raw little-endian blocks behind a small JSON header.
+
+    Layout: uint32 header length, header JSON, then each array's bytes in
+    header["arrays"] order. The header lists name, dtype and length per array and
+    carries every non-array field; float arrays are sent as float32, date
+    strings as int32 days since 1970-01-01.
+    """
+    header = {"arrays": []}
+    blocks = []
+    for name, value in _flatten(payload):
+        array = _as_block(value)
+        if array is None:
+            header[name] = value
+            continue
+        header["arrays"].append({"name": name, "dtype": array.dtype.str, "length": len(array)})
+        blocks.append(array.tobytes())
+    head = dumps(_plain(header))
+    return struct.pack("<I", len(head)) + head + b"".join(blocks)
+
+
+def _as_block(value):
+    """float32/int32 array for numeric or ISO-date sequences, None for anything else."""
+    if isinstance(value, np.ndarray):
+        return value.astype("<f4") if value.dtype.kind == "f" else value.astype("<i4")
+    if not isinstance(value, list) or not value:
+        return None
+    if all(isinstance(v, str) for v in value):
+        try:
+            return np.asarray(value, dtype="datetime64[D]").astype("<i4")
+        except ValueError:
+            return None
+    if all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in value):
+        return np.asarray(value, dtype="<f4")
+    return None
+
+
+def _flatten(payload, prefix=""):
+    for key, value in payload.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            yield from _flatten(value, name + ".")
+        else:
+            yield name, value
+
+
+def _q(params):
+    """Quality value from the parameters of one Accept/Accept-Encoding entry (1.0 if absent)."""
+    for param in params.split(";"):
+        name, _, value = param.strip().partition("=")
+        if name == "q":
+            try:
+                return float(value)
+            except ValueError:
+                return 0.0
+    return 1.0
+
+
+def negotiate(request):
+    """Response media type from ?format= or the Accept header (highest q wins, JSON by default)."""
+    fmt = request.query_params.get("format")
+    if fmt:
+        if fmt not in FORMATS:
+            raise HTTPException(status_code=400, detail=f"format must be one of {', '.join(FORMATS)}")
+        return FORMATS[fmt]
+    best, best_q = JSON, 0.0
+    for part in request.headers.get("accept", "").split(","):
+        media, _, params = part.strip().partition(";")
+        q = _q(params)
+        if media.strip() in MEDIA_TYPES and q > best_q:
+            best, best_q = MEDIA_TYPES[media.strip()], q
+    return best
+
+
+def _compress(request, body, headers):
+    if len(body) < config.COMPRESS_MIN_BYTES:
+        return body
+    accepted = set()
+    for part in request.headers.get("accept-encoding", "").split(","):
+        coding, _, params = part.partition(";")
+        # q=0 means "not acceptable"
+        if _q(params) > 0:
+            accepted.add(coding.strip().lower())
+    if brotli is not None and "br" in accepted:
+        headers["Content-Encoding"] = "br"
+        return brotli.compress(body, quality=config.BROTLI_QUALITY)
+    if "gzip" in accepted:
+        headers["Content-Encoding"] = "gzip"
+        return gzip.compress(body, compresslevel=config.GZIP_LEVEL)
+    return body
+
+
+def encode(request, columnar, legacy):
+    """Render one payload in the negotiated format.
+
+    `columnar` holds parallel arrays (ndarrays or lists) and is used by every
+    format except plain JSON; `legacy()` builds the original row-oriented body,
+    so existing clients see no change unless they ask for another format.
+    """
+    media_type = negotiate(request)
+    if media_type == JSON:
+        body = dumps(legacy())
+    elif media_type == COLUMNAR:
+        body = dumps(columnar)
+    elif media_type == MSGPACK:
+        if msgpack is None:
+            raise HTTPException(status_code=406, detail="MessagePack is not available on this server")
+        body = msgpack.packb(_plain(columnar))
+    else:
+        body = pack_float32(columnar)
+    headers = {"Vary": "Accept, Accept-Encoding"}
+    body = _compress(request, body, headers)
+    return Response(body, media_type=media_type, headers=headers)
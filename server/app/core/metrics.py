@@ -0,0 +1,152 @@
+import threading
+import time
+from contextlib import contextmanager
+
+# Latency buckets in seconds, from sub-millisecond steps up to slow LLM calls
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+# Set per thread by capture_observations(): observations are collected instead of recorded
+_capture = threading.local()
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram with a fixed label set (Prometheus semantics)."""
+
+    kind = "histogram"
+
+    def __init__(self, name, help, labels=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(labels)
+        self.buckets = tuple(buckets)
+        self._series = {}  # label values -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        captured = getattr(_capture, "observations", None)
+        if captured is not None:
+            captured.append((self.name, value, labels))
+            return
+        key = tuple(str(labels.get(name, "")) for name in self.label_names)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = {k: list(v) for k, v in self._series.items()}
+        for key, values in sorted(series.items()):
+            for bound, count in zip(self.buckets, values):
+                lines.append(f"{self.name}_bucket{_labels(self.label_names, key, [('le', bound)])} {count}")
+            lines.append(f"{self.name}_bucket{_labels(self.label_names, key, [('le', '+Inf')])} {values[-1]}")
+            lines.append(f"{self.name}_sum{_labels(self.label_names, key)} {values[-2]}")
+            lines.append(f"{self.name}_count{_labels(self.label_names, key)} {values[-1]}")
+        return lines
+
+
+class Registry:
+    """Holds histograms plus callbacks that report point-in-time gauges at scrape time."""
+
+    def __init__(self):
+        self._metrics = []
+        self._by_name = {}
+        self._collectors = []
+
+    def histogram(self, name, help, labels=(), buckets=DEFAULT_BUCKETS):
+        metric = Histogram(name, help, labels, buckets)
+        self._metrics.append(metric)
+        self._by_name[name] = metric
+        return metric
+
+    def replay(self, observations):
+        """Record observations collected by capture_observations(), e.g. in a worker process."""
+        for name, value, labels in observations:
+            metric = self._by_name.get(name)
+            if metric is not None:
+                metric.observe(value, **labels)
+
+    def register_collector(self, collect):
+        """`collect()` returns {metric_name: value} of gauges, evaluated on every scrape."""
+        self._collectors.append(collect)
+
+    def render(self):
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for collect in self._collectors:
+            for name, value in sorted(collect().items()):
+                lines.append(f"# TYPE {name} gauge")
+                lines.append(f"{name} {float(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def flatten_gauges(prefix, stats):
+    """{"pool": {"pending": 3}} -> {"<prefix>_pool_pending": 3}, keeping only numeric leaves."""
+    gauges = {}
+    for key, value in stats.items():
+        name = f"{prefix}_{key}".replace(".", "_").replace("+", "").replace("-", "_")
+        if isinstance(value, dict):
+            gauges.update(flatten_gauges(name, value))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            gauges[name] = value
+        elif isinstance(value, bool):
+            gauges[name] = int(value)
+    return gauges
+
+
+REGISTRY = Registry()
+
+HTTP_REQUEST_SECONDS = REGISTRY.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route", ("method", "route", "status"))
+FORECAST_STAGE_SECONDS = REGISTRY.histogram(
+    "forecast_stage_duration_seconds", "Time spent in each forecast pipeline stage", ("stage",))
+DB_OPERATION_SECONDS = REGISTRY.histogram(
+    "db_operation_duration_seconds", "MongoDB operation latency", ("operation",))
+LLM_REQUEST_SECONDS = REGISTRY.histogram(
+    "llm_request_duration_seconds", "Upstream LLM call latency", ("backend", "mode"))
+
+
+@contextmanager
+def capture_observations():
+    """Collect this thread's histogram observations into a list instead of recording them.
+
+    Process-pool workers have their own registry that /metrics never sees, so
+    they send the list back with the result for REGISTRY.replay() in the parent.
+    """
+    _capture.observations = observations = []
+    try:
+        yield observations
+    finally:
+        _capture.observations = None
+
+
+def stage(name):
+    """Time one forecast pipeline stage: `with stage("lstm"): ...`."""
+    return FORECAST_STAGE_SECONDS.time(stage=name)
@@ -0,0 +1,60 @@
+import collections
+import os
+import sys
+import threading
+import time
+
+
+class StackSampler:
+    """Background sampling profiler for slow-request flame graphs.
+
+    Every `interval` seconds it records the stack of every thread into a ring
+    buffer. When a request turns out to be slow, dump() writes the samples from
+    its time window in collapsed-stack format ("frame;frame;frame count"), ready
+    for flamegraph.pl or speedscope.
+    """
+
+    def __init__(self, out_dir, interval=0.005, max_samples=20000):
+        self.out_dir = out_dir
+        self.interval = interval
+        self._samples = collections.deque(maxlen=max_samples)  # (timestamp, thread name, stack)
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            now = time.perf_counter()
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                    frame = frame.f_back
+                self._samples.append((now, names.get(ident, str(ident)), ";".join(reversed(stack))))
+
+    def dump(self, started, finished, label):
+        """Write samples taken between two perf_counter() readings; returns the file path or None."""
+        folded = collections.Counter(
+            f"{thread};{stack}" for ts, thread, stack in list(self._samples) if started <= ts <= finished
+        )
+        if not folded:
+            return None
+        os.makedirs(self.out_dir, exist_ok=True)
+        safe = "".join(c if c.isalnum() else "_" for c in label).strip("_")
+        path = os.path.join(self.out_dir, f"{time.strftime('%Y%m%d-%H%M%S')}-{safe}.folded")
+        with open(path, "w") as f:
+            for stack, count in folded.most_common():
+                f.write(f"{stack} {count}\n")
+        return path
@@ -0,0 +1,103 @@
+import asyncio
+import inspect
+import threading
+import time
+
+
+class StartupReport:
+    """Per-component load state and timings, shared by the lifespan hook and /ready.
+
+    Each component is "pending", "loading", "ready", "failed" or "lazy" (not
+    needed until first use).
+    """
+
+    def __init__(self):
+        self.components = {}
+        self.started = time.perf_counter()
+        self.finished = None
+
+    def record(self, name, state, seconds=None, error=None):
+        entry = {"state": state}
+        if seconds is not None:
+            entry["seconds"] = round(seconds, 4)
+        if error is not None:
+            entry["error"] = error
+        self.components[name] = entry
+
+    def register(self, name, state="pending"):
+        self.record(name, state)
+
+    async def load(self, name, fn, *args):
+        """Run one loader, timing it; blocking callables go to a thread so loaders overlap."""
+        self.record(name, "loading")
+        started = time.perf_counter()
+        try:
+            if inspect.iscoroutinefunction(fn):
+                result = await fn(*args)
+            else:
+                result = await asyncio.to_thread(fn, *args)
+        except Exception as e:
+            self.record(name, "failed", time.perf_counter() - started, str(e))
+            raise
+        self.record(name, "ready", time.perf_counter() - started)
+        return result
+
+    def state(self, name):
+        return self.components.get(name, {}).get("state")
+
+    def is_ready(self, required=(), settled=()):
+        """All `required` components loaded, and every `settled` one finished, even if it failed."""
+        return (all(self.state(name) == "ready" for name in required)
+                and all(self.state(name) in ("ready", "failed") for name in settled))
+
+    def failed(self):
+        return {name: entry.get("error") for name, entry in self.components.items() if entry["state"] == "failed"}
+
+    def log_breakdown(self):
+        self.finished = time.perf_counter()
+        for name, entry in sorted(self.components.items(), key=lambda item: -item[1].get("seconds", 0)):
+            icon = {"ready": "✅", "failed": "❌"}.get(entry["state"], "⚠️")
+            seconds = f"{entry['seconds']:.3f}s" if "seconds" in entry else "-"
+            print(f"{icon} startup {name:<18} {entry['state']:<8} {seconds}")
+        total = sum(entry.get("seconds", 0) for entry in self.components.values())
+        print(f"✅ Startup finished in {self.finished - self.started:.3f}s ({total:.3f}s of component time)")
+
+    def snapshot(self):
+        return {
+            "uptime_s": round(time.perf_counter() - self.started, 3),
+            "startup_s": round(self.finished - self.started, 3) if self.finished else None,
+            "components": dict(self.components),
+        }
+
+
+class Lazy:
+    """Optional subsystem built on first use; the build time is recorded in the StartupReport."""
+
+    def __init__(self, name, factory, report):
+        self.name = name
+        self.factory = factory
+        self.report = report
+        self._value = None
+        self._lock = threading.Lock()
+        report.register(name, "lazy")
+
+    @property
+    def loaded(self):
+        return self._value is not None
+
+    def get(self):
+        if self._value is None:
+            with self._lock:
+                if self._value is None:
+                    started = time.perf_counter()
+                    try:
+                        self._value = self.factory()
+                    except Exception as e:
+                        self.report.record(self.name, "failed", time.perf_counter() - started, str(e))
+                        raise
+                    self.report.record(self.name, "ready", time.perf_counter() - started)
+        return self._value
+
+    async def aget(self):
+        # The first build may import heavy client libraries, so keep it off the event loop
+        return self._value if self._value is not None else await asyncio.to_thread(self.get)
@@ -1,18 +1,49 @@
-from pymongo import MongoClient
+from motor.motor_asyncio import AsyncIOMotorClient
 import os
 from dotenv import load_dotenv
+from app import config
 
 load_dotenv()
 
 MONGO_URI = os.getenv("MONGO_URI")
 DB_NAME = "stockAI"
 
-client = MongoClient(MONGO_URI)
-database = client[DB_NAME]
-users_collection = database["sus"]
 
-try:
-    client.admin.command('ping')
-    print("✅ Successfully connected to MongoDB!")
-except Exception as e:
-    print(f"❌ Failed to connect to MongoDB: {e}")
\ No newline at end of file
+def create_client(uri=MONGO_URI):
+    # Motor connects lazily, so building the client never blocks import
+    return AsyncIOMotorClient(
+        uri,
+        maxPoolSize=config.MONGO_MAX_POOL_SIZE,
+        minPoolSize=config.MONGO_MIN_POOL_SIZE,
+        serverSelectionTimeoutMS=config.MONGO_TIMEOUT_MS,
+        connectTimeoutMS=config.MONGO_TIMEOUT_MS,
+        socketTimeoutMS=config.MONGO_TIMEOUT_MS,
+        waitQueueTimeoutMS=config.MONGO_TIMEOUT_MS,
+        retryWrites=True,
+        retryReads=True,
+    )
+
+
+if config.MONGO_BACKEND == "memory":
+    from app.db.memory import InMemoryCollection
+    client = None
+    users_collection = InMemoryCollection()
+    sessions_collection = InMemoryCollection()
+else:
+    client = create_client()
+    database = client[DB_NAME]
+    users_collection = database["sus"]
+    sessions_collection = database["sessions"]
+
+
+async def ping():
+    if client is None:
+        print("✅ Using in-memory user store")
+        return True
+    try:
+        await client.admin.command('ping')
+        print("✅ Successfully connected to MongoDB!")
+        return True
+    except Exception as e:
+        print(f"❌ Failed to connect to MongoDB: {e}")
+        return False
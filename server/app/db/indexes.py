@@ -0,0 +1,29 @@
+from pymongo import ASCENDING
+from pymongo.errors import PyMongoError
+
+# Lookups go through email (auth) and username (every other handler). Documents
+# created by an upsert may not have an email yet, so that index is partial.
+USER_INDEXES = [
+    {"keys": [("email", ASCENDING)], "name": "email_unique", "unique": True,
+     "partialFilterExpression": {"email": {"$exists": True}}},
+    {"keys": [("username", ASCENDING)], "name": "username_unique", "unique": True},
+]
+
+# Refresh-token sessions are looked up by _id; expired ones are removed by Mongo's TTL monitor
+SESSION_INDEXES = [
+    {"keys": [("expires_at", ASCENDING)], "name": "expires_at_ttl", "expireAfterSeconds": 0},
+    {"keys": [("email", ASCENDING)], "name": "email"},
+]
+
+
+async def ensure_indexes(collection, indexes=USER_INDEXES):
+    """Create any missing indexes; safe to call on every startup."""
+    created = []
+    for spec in indexes:
+        options = {k: v for k, v in spec.items() if k != "keys"}
+        try:
+            created.append(await collection.create_index(spec["keys"], **options))
+        except PyMongoError as e:
+            # e.g. duplicate usernames already stored: keep serving, but make it visible
+            print(f"❌ Could not create index {spec['name']}: {e}")
+    return created
@@ -0,0 +1,102 @@
+import asyncio
+import copy
+from bson import ObjectId
+from pymongo.errors import DuplicateKeyError
+
+
+def _project(doc, projection):
+    doc = copy.deepcopy(doc)
+    if not projection:
+        return doc
+    slices = {k: v["$slice"] for k, v in projection.items() if isinstance(v, dict) and "$slice" in v}
+    flags = {k: v for k, v in projection.items() if not isinstance(v, dict)}
+    included = {k for k, v in flags.items() if v and k != "_id"}
+    if included:
+        out = {k: doc[k] for k in included | set(slices) if k in doc}
+        if flags.get("_id", 1) and "_id" in doc:
+            out["_id"] = doc["_id"]
+    else:
+        out = {k: v for k, v in doc.items() if flags.get(k, 1)}
+    for field, spec in slices.items():
+        if isinstance(out.get(field), list):
+            skip, limit = spec if isinstance(spec, list) else (0, spec)
+            out[field] = out[field][skip:skip + limit]
+    return out
+
+
+class _UpdateResult:
+    def __init__(self, matched_count, modified_count, upserted_id=None):
+        self.matched_count = matched_count
+        self.modified_count = modified_count
+        self.upserted_id = upserted_id
+
+
+class _InsertResult:
+    def __init__(self, inserted_id):
+        self.inserted_id = inserted_id
+
+
+class InMemoryCollection:
+    """Async stand-in for the subset of the Motor collection API the repository uses.
+
+    Supports equality filters, inclusion/exclusion projections with $slice,
+    $set/$setOnInsert/$push($each) updates with upsert, and unique indexes.
+    """
+
+    def __init__(self):
+        self._docs = []
+        self._unique = []
+        self._lock = asyncio.Lock()
+
+    def _match(self, filter):
+        """(position, document) of the first match, or (None, None)."""
+        for i, doc in enumerate(self._docs):
+            if all(doc.get(k) == v for k, v in filter.items()):
+                return i, doc
+        return None, None
+
+    def _check_unique(self, candidate, ignore=None):
+        for field in self._unique:
+            if field not in candidate:
+                continue
+            for doc in self._docs:
+                if doc is not ignore and doc.get(field) == candidate[field]:
+                    raise DuplicateKeyError(f"E11000 duplicate key error: {field}={candidate[field]!r}")
+
+    async def create_index(self, keys, unique=False, name=None, **_):
+        if unique and len(keys) == 1:
+            self._unique.append(keys[0][0])
+        return name or "_".join(f"{k}_{d}" for k, d in keys)
+
+    async def find_one(self, filter, projection=None):
+        _, doc = self._match(filter)
+        return _project(doc, projection) if doc is not None else None
+
+    async def insert_one(self, document):
+        async with self._lock:
+            document = copy.deepcopy(document)
+            document.setdefault("_id", ObjectId())
+            self._check_unique(document)
+            self._docs.append(document)
+            return _InsertResult(document["_id"])
+
+    async def update_one(self, filter, update, upsert=False):
+        async with self._lock:
+            position, doc = self._match(filter)
+            upserted_id = None
+            if doc is None:
+                if not upsert:
+                    return _UpdateResult(0, 0)
+                doc = {"_id": ObjectId(), **copy.deepcopy(filter), **copy.deepcopy(update.get("$setOnInsert", {}))}
+                upserted_id = doc["_id"]
+            updated = copy.deepcopy(doc)
+            updated.update(copy.deepcopy(update.get("$set", {})))
+            for field, value in update.get("$push", {}).items():
+                values = value["$each"] if isinstance(value, dict) and "$each" in value else [value]
+                updated.setdefault(field, []).extend(copy.deepcopy(values))
+            self._check_unique(updated, ignore=doc)
+            if upserted_id is not None:
+                self._docs.append(updated)
+            else:
+                self._docs[position] = updated
+            return _UpdateResult(0 if upserted_id else 1, 1, upserted_id)
@@ -0,0 +1,76 @@
+import asyncio
+from pymongo.errors import AutoReconnect, NetworkTimeout
+from app import config
+from app.core.metrics import DB_OPERATION_SECONDS
+from app.db.connect import users_collection
+from app.db.indexes import USER_INDEXES, ensure_indexes
+
+
+class UserRepository:
+    """All user-document access goes through here instead of the raw collection.
+
+    Reads are retried with exponential backoff on transient network errors.
+    Writes are not: a retried $push could apply twice, and the driver's
+    retryWrites already covers the safe single retry.
+    """
+
+    def __init__(self, collection, read_retries=config.MONGO_READ_RETRIES,
+                 backoff_ms=config.MONGO_RETRY_BACKOFF_MS):
+        self.collection = collection
+        self.read_retries = read_retries
+        self.backoff_s = backoff_ms / 1000.0
+
+    async def _read(self, op, *args, **kwargs):
+        for attempt in range(self.read_retries + 1):
+            try:
+                with DB_OPERATION_SECONDS.time(operation=getattr(op, "__name__", "read")):
+                    return await op(*args, **kwargs)
+            except (AutoReconnect, NetworkTimeout):
+                if attempt == self.read_retries:
+                    raise
+                await asyncio.sleep(self.backoff_s * 2 ** attempt)
+
+    async def find_by(self, field, value, projection=None):
+        return await self._read(self.collection.find_one, {field: value}, projection)
+
+    async def find_by_email(self, email, projection=None):
+        return await self.find_by("email", email, projection)
+
+    async def find_by_username(self, username, projection=None):
+        return await self.find_by("username", username, projection)
+
+    async def create(self, document):
+        with DB_OPERATION_SECONDS.time(operation="insert_one"):
+            return await self.collection.insert_one(document)
+
+    async def update(self, username, changes, upsert=True):
+        """Apply one update document to a user's record, creating it if needed."""
+        with DB_OPERATION_SECONDS.time(operation="update_one"):
+            return await self.collection.update_one({"username": username}, changes, upsert=upsert)
+
+    async def assets_page(self, username, cursor, limit):
+        """Up to `limit` assets starting at offset `cursor`, plus the next cursor (or None)."""
+        # Fetch one extra element to know whether another page exists, and nothing but the slice
+        user = await self.find_by_username(
+            username, {"_id": 0, "username": 1, "assets": {"$slice": [cursor, limit + 1]}}
+        )
+        assets = (user or {}).get("assets", [])
+        next_cursor = cursor + limit if len(assets) > limit else None
+        return assets[:limit], next_cursor
+
+    async def find_sections(self, username, sections, assets_limit=None):
+        """One read of the requested top-level sections; "assets" comes back as its first page."""
+        projection = {"_id": 0, "username": 1}
+        for section in sections:
+            if section == "assets":
+                # One extra element tells whether a second page exists
+                projection["assets"] = {"$slice": [0, assets_limit + 1]}
+            else:
+                projection[section] = 1
+        return await self.find_by_username(username, projection)
+
+    async def ensure_indexes(self, indexes=USER_INDEXES):
+        return await ensure_indexes(self.collection, indexes)
+
+
+users = UserRepository(users_collection)
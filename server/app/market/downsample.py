@@ -0,0 +1,189 @@
+import threading
+import weakref
+import numpy as np
+
+
+def lttb(x, y, n_out):
+    """Largest-Triangle-Three-Buckets: indices of `n_out` points that keep the shape of (x, y).
+
+    Exact LTTB: each bucket's pick depends on the previous pick, so buckets are
+    visited in order, but the triangle areas inside a bucket are one NumPy call.
+    The first and last points are always kept.
+    """
+    n = len(y)
+    if n_out >= n or n <= 2:
+        return np.arange(n)
+    if n_out < 3:
+        return np.array([0, n - 1])
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    # n_out - 2 buckets over the interior points, each non-empty
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    csx = np.concatenate(([0.0], np.cumsum(x)))
+    csy = np.concatenate(([0.0], np.cumsum(y)))
+    counts = np.diff(edges)
+    avg_x = (csx[edges[1:]] - csx[edges[:-1]]) / counts
+    avg_y = (csy[edges[1:]] - csy[edges[:-1]]) / counts
+    # Third vertex of each triangle: the next bucket's centroid, or the last point
+    next_x = np.append(avg_x[1:], x[-1])
+    next_y = np.append(avg_y[1:], y[-1])
+
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        area = np.abs((x[a] - next_x[i]) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (next_y[i] - y[a]))
+        a = lo + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+
+def lttb_vectorized(x, y, n_out):
+    """Single-pass LTTB variant: the previous bucket's centroid stands in for the previous pick.
+
+    All buckets are scored at once on a padded (buckets, width) matrix, so the
+    cost is a handful of array operations regardless of `n_out`. Used to trim an
+    already downsampled pyramid level, where buckets hold only a few points.
+    """
+    n = len(y)
+    if n_out >= n or n <= 2:
+        return np.arange(n)
+    if n_out < 3:
+        return np.array([0, n - 1])
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    counts = np.diff(edges)
+    csx = np.concatenate(([0.0], np.cumsum(x)))
+    csy = np.concatenate(([0.0], np.cumsum(y)))
+    avg_x = (csx[edges[1:]] - csx[edges[:-1]]) / counts
+    avg_y = (csy[edges[1:]] - csy[edges[:-1]]) / counts
+    prev_x, prev_y = np.insert(avg_x[:-1], 0, x[0]), np.insert(avg_y[:-1], 0, y[0])
+    next_x, next_y = np.append(avg_x[1:], x[-1]), np.append(avg_y[1:], y[-1])
+
+    # (buckets, widest bucket) candidate positions; padding slots score -1 and never win
+    offsets = np.arange(counts.max())
+    positions = edges[:-1, None] + offsets[None, :]
+    valid = offsets[None, :] < counts[:, None]
+    positions = np.where(valid, positions, edges[:-1, None])
+    px, py = x[positions], y[positions]
+    area = np.abs((prev_x[:, None] - next_x[:, None]) * (py - prev_y[:, None])
+                  - (prev_x[:, None] - px) * (next_y[:, None] - prev_y[:, None]))
+    area = np.where(valid, area, -1.0)
+    picks = positions[np.arange(len(counts)), np.argmax(area, axis=1)]
+    return np.concatenate(([0], picks, [n - 1]))
+
+
+def _bucket_picks(x, y, width, first, a):
+    """LTTB picks for the fixed-width buckets `first`, `first + 1`, ... of one pyramid level.
+
+    Bucket b covers interior rows [1 + b*width, 1 + (b+1)*width), clipped at the
+    last row; `a` is the pick of bucket `first - 1` (row 0 before the first).
+    """
+    n = len(y)
+    starts = np.arange(1 + first * width, n - 1, width)
+    picks = np.empty(len(starts), dtype=np.int64)
+    for k, lo in enumerate(starts):
+        hi = min(lo + width, n - 1)
+        if k + 1 < len(starts):
+            nlo, nhi = hi, min(hi + width, n - 1)
+            cx, cy = x[nlo:nhi].mean(), y[nlo:nhi].mean()
+        else:
+            cx, cy = x[n - 1], y[n - 1]
+        area = np.abs((x[a] - cx) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (cy - y[a]))
+        a = lo + int(np.argmax(area))
+        picks[k] = a
+    return picks
+
+
+class Pyramid:
+    """Multi-resolution LTTB levels of one series, each half the size of the one below.
+
+    Level k runs LTTB over buckets of a fixed 2**k rows aligned to the start of
+    the series, so appending rows changes only the last two buckets of each
+    level: extended() recomputes those and reuses every other pick. A request
+    for `max_points` over [start, end) takes the coarsest level that still has
+    at least that many points in the range and trims it with lttb_vectorized,
+    so the per-request cost follows `max_points`, not the length of the history.
+    """
+
+    def __init__(self, x, y, min_points=64, _picks=None):
+        self.x = np.asarray(x, dtype=np.float64)
+        self.y = np.asarray(y, dtype=np.float64)
+        self.min_points = min_points
+        n = len(self.y)
+        self._picks = {}  # bucket width -> interior picks
+        self.levels = [np.arange(n)]
+        width = 2
+        while n // width >= min_points:
+            picks = (_picks or {}).get(width)
+            if picks is None:
+                picks = _bucket_picks(self.x, self.y, width, 0, 0)
+            self._picks[width] = picks
+            self.levels.append(np.concatenate(([0], picks, [n - 1])))
+            width *= 2
+
+    def extended(self, x, y):
+        """Pyramid of this series with rows appended; only the tail buckets are recomputed."""
+        old_n = len(self.y)
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        picks = {}
+        for width, old in self._picks.items():
+            # The bucket holding the old last row gains points, and the one before it a new neighbour
+            first = max(0, (old_n - 2) // width - 1)
+            a = int(old[first - 1]) if first > 0 else 0
+            picks[width] = np.concatenate((old[:first], _bucket_picks(x, y, width, first, a)))
+        return Pyramid(x, y, self.min_points, picks)
+
+    def select(self, start, end, max_points):
+        """Sorted indices (into the full series) of at most `max_points` points in [start, end)."""
+        if end - start <= max_points:
+            return np.arange(start, end)
+        chosen = self.levels[0]
+        for level in reversed(self.levels):
+            lo, hi = np.searchsorted(level, [start, end])
+            if hi - lo >= max_points:
+                chosen = level
+                break
+        lo, hi = np.searchsorted(chosen, [start, end])
+        # The range's own end points are kept even when the level skipped them
+        candidates = np.unique(np.concatenate(([start], chosen[lo:hi], [end - 1])))
+        keep = lttb_vectorized(self.x[candidates], self.y[candidates], max_points)
+        return candidates[keep]
+
+
+class SeriesPyramids:
+    """Pyramids per (snapshot, column), built on first use and dropped with the snapshot.
+
+    A snapshot made by appending rows extends its parent's pyramid when it is cached.
+    """
+
+    def __init__(self, min_points=64):
+        self.min_points = min_points
+        self._pyramids = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def pyramid(self, snapshot, column):
+        with self._lock:
+            per_snapshot = self._pyramids.setdefault(snapshot, {})
+            pyramid = per_snapshot.get(column)
+            if pyramid is None:
+                # Trading days as x, so gaps (weekends, holidays) keep their width
+                x = snapshot.dates.astype(np.int64)
+                parent = snapshot.parent() if snapshot.parent is not None else None
+                base = self._pyramids.get(parent, {}).get(column) if parent is not None else None
+                if base is not None:
+                    pyramid = base.extended(x, snapshot.columns[column])
+                else:
+                    pyramid = Pyramid(x, snapshot.columns[column], self.min_points)
+                per_snapshot[column] = pyramid
+            return pyramid
+
+    def downsample(self, snapshot, column, start, end, max_points):
+        """(dates, values) of `column` over [start, end), reduced to at most `max_points` points."""
+        if max_points is None or end - start <= max_points:
+            return snapshot.date_strings[start:end], snapshot.columns[column][start:end]
+        indices = self.pyramid(snapshot, column).select(start, end, max_points)
+        return [snapshot.date_strings[i] for i in indices], snapshot.columns[column][indices]
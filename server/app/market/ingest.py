@@ -0,0 +1,171 @@
+"""Incremental ingestion of new trading days into a market dataset.
+
+Rows carry Date, Open, High, Low, Close, Adj close, Volume, Sentiment_gpt and
+News_flag; Scaled_sentiment is derived here. Rows are appended to the dataset's
+column store and CSV in batches, so a feed can be streamed in as it arrives.
+Replaying rows is harmless: days already stored are skipped.
+
+Run from server/:  python -m app.market.ingest [--symbol DEFAULT] [FILE ...]   (CSV; stdin if no FILE or "-")
+"""
+import argparse
+import csv
+import math
+import sys
+import numpy as np
+from app import config
+from app.market.store import COLUMN_DTYPES, DATE_COLUMN, MarketDataStore
+
+INPUT_COLUMNS = ["Open", "High", "Low", "Close", "Adj close", "Volume", "Sentiment_gpt", "News_flag"]
+
+# Sentiment_gpt is a 1-5 score; Scaled_sentiment maps it onto [0, 1] plus a small
+# offset, which matches every row of latest_dataset.csv. On days without news the
+# score decays toward neutral by exp(-0.05) per calendar day since the previous
+# row. That matches every no-news row of latest_dataset.csv except 33 that follow
+# news on a weekend or holiday, which the stored rows do not record, so a feed
+# should send Sentiment_gpt whenever it has it.
+SENTIMENT_MIN, SENTIMENT_MAX = 1.0, 5.0
+SENTIMENT_NEUTRAL = 3.0
+SENTIMENT_DECAY_PER_DAY = 0.05
+SCALED_SENTIMENT_OFFSET = 2.5e-5
+
+
+def scale_sentiment(sentiment):
+    return (sentiment - SENTIMENT_MIN) / (SENTIMENT_MAX - SENTIMENT_MIN) + SCALED_SENTIMENT_OFFSET
+
+
+def parse_rows(records):
+    """Validate raw rows (dicts of strings or numbers) into sorted, unique dates + typed columns.
+
+    Sentiment_gpt may be left empty on rows with News_flag 0; it is filled in by
+    derive_sentiment(). When a batch repeats a date, the first row wins.
+    """
+    parsed = {}
+    for number, record in enumerate(records, start=1):
+        if not isinstance(record, dict):
+            raise ValueError(f"row {number}: expected an object keyed by column name")
+        try:
+            day = np.datetime64(str(record[DATE_COLUMN]).strip()[:10], "D")
+            values = {}
+            for name in INPUT_COLUMNS:
+                raw = record.get(name)
+                if raw is None or str(raw).strip() == "":
+                    if name == "Sentiment_gpt":
+                        values[name] = math.nan
+                        continue
+                    raise ValueError(f"missing {name}")
+                values[name] = float(raw)
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"row {number}: {e}") from None
+        if values["News_flag"] >= 0.5 and math.isnan(values["Sentiment_gpt"]):
+            raise ValueError(f"row {number}: Sentiment_gpt is required on news days")
+        parsed.setdefault(day, values)
+
+    dates = np.array(sorted(parsed), dtype="datetime64[D]")
+    columns = {name: np.array([parsed[day][name] for day in dates]) for name in INPUT_COLUMNS}
+    columns["Volume"] = columns["Volume"].astype(COLUMN_DTYPES["Volume"])
+    return dates, columns
+
+
+def derive_sentiment(snapshot, dates, columns):
+    """Fill missing Sentiment_gpt and compute Scaled_sentiment for rows appended after `snapshot`.
+
+    Each missing score decays from the row before it, so only the last stored
+    row is read and the cost is O(new rows). Passed to MarketDataStore.append as
+    `prepare`, i.e. under the store lock.
+    """
+    sentiment = columns["Sentiment_gpt"].astype(np.float64).copy()
+    if len(snapshot):
+        last_day, last_sentiment = snapshot.dates[-1], float(snapshot.columns["Sentiment_gpt"][-1])
+    else:
+        last_day, last_sentiment = None, SENTIMENT_NEUTRAL
+    for i, day in enumerate(dates):
+        if math.isnan(sentiment[i]):
+            days = int((day - last_day).astype(np.int64)) if last_day is not None else 0
+            decay = math.exp(-SENTIMENT_DECAY_PER_DAY * days)
+            sentiment[i] = SENTIMENT_NEUTRAL + (last_sentiment - SENTIMENT_NEUTRAL) * decay
+        last_day, last_sentiment = day, sentiment[i]
+    return {**columns, "Sentiment_gpt": sentiment, "Scaled_sentiment": scale_sentiment(sentiment)}
+
+
+def ingest(store, records):
+    """Append one batch of raw rows; returns (snapshot, summary)."""
+    dates, columns = parse_rows(records)
+    return store.append(dates, columns, prepare=derive_sentiment)
+
+
+def merge_summary(total, summary):
+    total["appended"] = total.get("appended", 0) + summary["appended"]
+    total["duplicates"] = total.get("duplicates", 0) + summary["duplicates"]
+    total["rejected"] = total.get("rejected", []) + summary["rejected"]
+    total["rows"] = summary["rows"]
+    return total
+
+
+def batches(rows, batch_size):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+async def csv_batches(chunks, batch_size):
+    """Async CSV rows from a byte stream (e.g. a request body), grouped into batches.
+
+    Lines are decoded as they arrive, so a long upload is ingested while it is
+    still being received.
+    """
+    header, pending, batch = None, b"", []
+    async for chunk in chunks:
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            line = line.decode().strip()
+            if not line:
+                continue
+            if header is None:
+                header = next(csv.reader([line]))
+                continue
+            batch.append(dict(zip(header, next(csv.reader([line])))))
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+    if pending.strip() and header is not None:
+        batch.append(dict(zip(header, next(csv.reader([pending.decode().strip()])))))
+    if batch:
+        yield batch
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Append new trading days to a market dataset.")
+    parser.add_argument("files", nargs="*", default=["-"], help="CSV files with a header row (default: stdin)")
+    parser.add_argument("--symbol", default=config.MARKET_DATA_SYMBOL, choices=sorted(config.MARKET_DATASETS))
+    parser.add_argument("--batch-size", type=int, default=config.INGEST_BATCH_SIZE)
+    args = parser.parse_args()
+
+    store = MarketDataStore(config.MARKET_DATASETS[args.symbol])
+    total = {}
+    for name in args.files:
+        handle = sys.stdin if name == "-" else open(name, newline="")
+        try:
+            for batch in batches(csv.DictReader(handle), args.batch_size):
+                _, summary = ingest(store, batch)
+                merge_summary(total, summary)
+                print(f"✅ {args.symbol}: +{summary['appended']} rows "
+                      f"({summary['duplicates']} duplicates, {len(summary['rejected'])} rejected)")
+        except ValueError as e:
+            print(f"❌ {name}: {e}")
+            sys.exit(1)
+        finally:
+            if handle is not sys.stdin:
+                handle.close()
+    if total.get("rejected"):
+        print(f"⚠️ Rejected days older than the last stored one: {', '.join(total['rejected'])}")
+    print(f"✅ {args.symbol} now has {total.get('rows', len(store.snapshot()))} rows")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,360 @@
+import json
+import operator
+import os
+import threading
+import weakref
+from collections.abc import Sequence
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: appends are only serialized within one process
+    fcntl = None
+
+# Numeric columns of latest_dataset.csv and their on-disk dtypes
+COLUMN_DTYPES = {
+    "Open": "<f8",
+    "High": "<f8",
+    "Low": "<f8",
+    "Close": "<f8",
+    "Adj close": "<f8",
+    "Volume": "<i8",
+    "Sentiment_gpt": "<f8",
+    "News_flag": "<f8",
+    "Scaled_sentiment": "<f8",
+}
+DATE_COLUMN = "Date"
+STORE_VERSION = 2
+
+
+class GrowableArray:
+    """Append-only array with amortized O(1) growth along the first axis.
+
+    view() is the filled prefix. Rows are only ever written past the current
+    size, so views handed out earlier keep their contents; when capacity runs
+    out the data moves to a buffer twice as large and old views keep the old one.
+    """
+
+    def __init__(self, initial):
+        initial = np.asarray(initial)
+        self._data = np.empty((max(2 * len(initial), 16),) + initial.shape[1:], dtype=initial.dtype)
+        self._data[:len(initial)] = initial
+        self.size = len(initial)
+
+    def extend(self, rows):
+        end = self.size + len(rows)
+        if end > len(self._data):
+            grown = np.empty((max(end, 2 * len(self._data)),) + self._data.shape[1:], dtype=self._data.dtype)
+            grown[:self.size] = self._data[:self.size]
+            self._data = grown
+        self._data[self.size:end] = rows
+        self.size = end
+        return self.view()
+
+    def view(self):
+        return self._data[:self.size]
+
+
+class _Prefix(Sequence):
+    """Read-only view of the first `n` items of a list that later snapshots keep appending to."""
+
+    def __init__(self, items, n):
+        self._items = items
+        self._n = n
+
+    def __len__(self):
+        return self._n
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self._items[slice(*index.indices(self._n))]
+        index = operator.index(index)
+        if not -self._n <= index < self._n:
+            raise IndexError("date index out of range")
+        return self._items[index % self._n]
+
+
+class MarketSnapshot:
+    """Immutable, fully loaded view of the dataset: typed columns indexed by trading date.
+
+    `base` names the full load this snapshot descends from; snapshots produced
+    by appending rows keep it, since every row of their parent is unchanged.
+    """
+
+    def __init__(self, dates, columns, signature, base=None, date_list=None, parent=None):
+        self.dates = dates  # datetime64[D], sorted ascending
+        self.columns = columns
+        self.signature = signature
+        self.base = base if base is not None else signature
+        self._date_list = date_list if date_list is not None else np.datetime_as_string(dates, unit="D").tolist()
+        self.date_strings = _Prefix(self._date_list, len(dates))
+        self.parent = weakref.ref(parent) if parent is not None else None
+        self._buffers = None  # GrowableArrays shared with the snapshots appended to this one
+
+    def extended(self, dates, columns, signature):
+        """This snapshot plus rows dated after its last one, sharing storage: O(new rows)."""
+        if self._buffers is None or self._buffers[DATE_COLUMN].size != len(self):
+            # First append (or a sibling already grew the buffers): start buffers from this view
+            self._buffers = {DATE_COLUMN: GrowableArray(self.dates)}
+            self._buffers.update({name: GrowableArray(values) for name, values in self.columns.items()})
+        buffers = self._buffers
+        new_dates = buffers[DATE_COLUMN].extend(dates)
+        new_columns = {name: buffers[name].extend(columns[name]) for name in self.columns}
+        date_list = self._date_list if len(self._date_list) == len(self) else self._date_list[:len(self)]
+        date_list.extend(np.datetime_as_string(dates, unit="D").tolist())
+        child = MarketSnapshot(new_dates, new_columns, signature, self.base, date_list, parent=self)
+        child._buffers = buffers
+        return child
+
+    def __len__(self):
+        return len(self.dates)
+
+    def index_of(self, as_of):
+        """Position one past the last row dated on or before `as_of` (None = end of data)."""
+        if as_of is None:
+            return len(self.dates)
+        return int(np.searchsorted(self.dates, np.datetime64(as_of, "D"), side="right"))
+
+    def window(self, columns, length, as_of=None):
+        """(length, len(columns)) float64 matrix ending at `as_of`, or None if history is too short."""
+        end = self.index_of(as_of)
+        if end < length:
+            return None
+        return np.column_stack([self.columns[name][end - length:end] for name in columns]).astype(np.float64)
+
+    def history_range(self, length, as_of=None):
+        """[start, end) positions of up to `length` rows ending at `as_of`."""
+        end = self.index_of(as_of)
+        return max(0, end - length), end
+
+    def previous_columns(self, length, as_of=None):
+        """(dates, closes) of up to `length` rows ending at `as_of`, as parallel sequences."""
+        start, end = self.history_range(length, as_of)
+        return self.date_strings[start:end], self.columns["Close"][start:end]
+
+    def previous_closes(self, length, as_of=None):
+        dates, closes = self.previous_columns(length, as_of)
+        return [{"date": d, "close": c} for d, c in zip(dates, closes.tolist())]
+
+
+class MarketDataStore:
+    """Loads latest_dataset.csv once and reloads it only when the file changes.
+
+    Parsed columns are also written as raw little-endian binaries under
+    `<csv>.store/` and memory-mapped on the next cold start, so a restart does
+    not re-parse the CSV unless its mtime or size changed.
+
+    New trading days go through append(): the rows are added to the end of each
+    column file and of the CSV, and meta.json is then switched to the new row
+    count and CSV signature, so nothing already stored is rewritten or re-parsed.
+    """
+
+    def __init__(self, csv_path, store_dir=None):
+        self.csv_path = csv_path
+        self.store_dir = store_dir or os.path.splitext(csv_path)[0] + ".store"
+        self._lock = threading.Lock()
+        self._snapshot = None
+
+    def _csv_signature(self):
+        st = os.stat(self.csv_path)
+        return [st.st_mtime_ns, st.st_size]
+
+    def is_stale(self):
+        return self._snapshot is None or self._snapshot.signature != self._csv_signature()
+
+    def snapshot(self):
+        """Current snapshot, reloading first if the CSV changed on disk."""
+        if self.is_stale():
+            self.refresh()
+        return self._snapshot
+
+    def refresh(self):
+        with self._lock:
+            return self._refresh_locked()
+
+    def _refresh_locked(self):
+        signature = self._csv_signature()
+        if self._snapshot is not None and self._snapshot.signature == signature:
+            return self._snapshot
+        snapshot = self._load_binary(signature)
+        if snapshot is None:
+            snapshot = self._parse_csv(signature)
+            self._write_binary(snapshot)
+        self._snapshot = snapshot
+        return snapshot
+
+    def _column_path(self, name):
+        return os.path.join(self.store_dir, name.replace(" ", "_") + ".bin")
+
+    def _meta_path(self):
+        return os.path.join(self.store_dir, "meta.json")
+
+    def _read_meta(self):
+        try:
+            with open(self._meta_path()) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _load_binary(self, signature):
+        meta = self._read_meta()
+        if not meta or meta.get("version") != STORE_VERSION or meta.get("source") != signature:
+            return None
+        rows = meta["rows"]
+        try:
+            dates = self._map(DATE_COLUMN, "<i8", rows).view("datetime64[D]")
+            columns = {name: self._map(name, dtype, rows) for name, dtype in COLUMN_DTYPES.items()}
+        except (OSError, ValueError):
+            return None
+        return MarketSnapshot(dates, columns, signature, base=meta.get("base"))
+
+    def _map(self, name, dtype, rows):
+        if rows == 0:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(self._column_path(name), dtype=dtype, mode="r", shape=(rows,))
+
+    def _replace_column(self, name, values):
+        # Write a new inode and swap it in: older snapshots may still have the previous file mapped
+        path = self._column_path(name)
+        values.tofile(path + ".tmp")
+        os.replace(path + ".tmp", path)
+
+    def _parse_csv(self, signature):
+        import pandas as pd
+
+        df = pd.read_csv(self.csv_path)
+        dates = pd.to_datetime(df[DATE_COLUMN], utc=True).dt.tz_convert(None).values.astype("datetime64[D]")
+        order = np.argsort(dates, kind="stable")
+        columns = {
+            name: np.ascontiguousarray(df[name].to_numpy()[order], dtype=dtype)
+            for name, dtype in COLUMN_DTYPES.items()
+        }
+        return MarketSnapshot(dates[order], columns, signature)
+
+    def _write_binary(self, snapshot):
+        try:
+            os.makedirs(self.store_dir, exist_ok=True)
+            # Drop the meta first so a crash mid-write leaves an invalid (rebuilt) store
+            if os.path.exists(self._meta_path()):
+                os.remove(self._meta_path())
+            self._replace_column(DATE_COLUMN, snapshot.dates.view("<i8"))
+            for name in COLUMN_DTYPES:
+                self._replace_column(name, snapshot.columns[name])
+            self._write_meta(snapshot)
+        except OSError as e:
+            # The binary copy is only a cold-start accelerator; serving continues from memory
+            print(f"⚠️ Could not write market data store: {e}")
+
+    def _write_meta(self, snapshot):
+        meta = {
+            "version": STORE_VERSION,
+            "source": snapshot.signature,
+            "base": snapshot.base,
+            "rows": len(snapshot),
+            "columns": {DATE_COLUMN: "<i8", **COLUMN_DTYPES},
+        }
+        tmp = self._meta_path() + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp, self._meta_path())
+
+    def append(self, dates, columns, prepare=None):
+        """Append rows (sorted, unique datetime64[D] dates + typed columns), deduplicating on Date.
+
+        Rows dated on a day already stored are skipped, so replaying a feed is a
+        no-op; rows older than the last stored day but missing from it are
+        rejected, since adding them would mean rewriting the store. `prepare(
+        snapshot, dates, columns)` runs under the lock on the accepted rows and
+        returns the columns to store (it derives Scaled_sentiment during ingest).
+        Returns (snapshot, summary).
+        """
+        with self._lock, self._file_lock():
+            # Another process may have appended since our last look
+            current = self._refresh_locked()
+
+            dates = np.asarray(dates, dtype="datetime64[D]")
+            if len(current):
+                fresh = dates > current.dates[-1]
+                pos = np.minimum(np.searchsorted(current.dates, dates), len(current) - 1)
+                known = ~fresh & (current.dates[pos] == dates)
+            else:
+                fresh = np.ones(len(dates), dtype=bool)
+                known = ~fresh
+            summary = {
+                "appended": int(fresh.sum()),
+                "duplicates": int(known.sum()),
+                "rejected": np.datetime_as_string(dates[~fresh & ~known], unit="D").tolist(),
+            }
+            if not fresh.any():
+                summary["rows"] = len(current)
+                return current, summary
+
+            dates = dates[fresh]
+            columns = {name: np.asarray(values)[fresh] for name, values in columns.items()}
+            if prepare is not None:
+                columns = prepare(current, dates, columns)
+            columns = {name: np.ascontiguousarray(columns[name], dtype=dtype) for name, dtype in COLUMN_DTYPES.items()}
+
+            # CSV first: it is the source of truth, and its header check fails before anything is written
+            self._append_csv(dates, columns)
+            stored = self._append_binary(len(current), dates, columns)
+            snapshot = current.extended(dates, columns, self._csv_signature())
+            try:
+                if stored:
+                    self._write_meta(snapshot)
+                elif os.path.exists(self._meta_path()):
+                    # Column files are behind the CSV: make the next cold start re-parse it
+                    os.remove(self._meta_path())
+            except OSError as e:
+                print(f"⚠️ Could not update market data store: {e}")
+            self._snapshot = snapshot
+            summary["rows"] = len(snapshot)
+            return snapshot, summary
+
+    def _file_lock(self):
+        """Exclusive lock across processes (API workers, the ingest CLI) for the duration of an append."""
+        os.makedirs(self.store_dir, exist_ok=True)
+        return _FileLock(os.path.join(self.store_dir, "append.lock"))
+
+    def _append_binary(self, rows, dates, columns):
+        try:
+            for name, values in [(DATE_COLUMN, dates.view("<i8"))] + list(columns.items()):
+                with open(self._column_path(name), "ab") as f:
+                    # Drop bytes past the committed row count left by an interrupted append
+                    f.truncate(rows * values.dtype.itemsize)
+                    f.write(values.tobytes())
+            return True
+        except OSError as e:
+            print(f"⚠️ Could not append to market data store: {e}")
+            return False
+
+    def _append_csv(self, dates, columns):
+        header = ",".join([DATE_COLUMN, *COLUMN_DTYPES])
+        lines = []
+        for i, stamp in enumerate(np.datetime_as_string(dates, unit="D")):
+            values = [repr(columns[name][i].item()) for name in COLUMN_DTYPES]
+            lines.append(",".join([f"{stamp} 00:00:00+00:00"] + values))
+        with open(self.csv_path, "rb+") as f:
+            if f.readline().decode().strip() != header:
+                raise ValueError(f"{self.csv_path} does not have the expected columns: {header}")
+            f.seek(0, os.SEEK_END)
+            f.seek(f.tell() - 1)
+            prefix = "" if f.read(1) == b"\n" else "\n"
+            f.write((prefix + "\n".join(lines) + "\n").encode())
+
+
+class _FileLock:
+    def __init__(self, path):
+        self.path = path
+        self._file = None
+
+    def __enter__(self):
+        self._file = open(self.path, "a")
+        if fcntl is not None:
+            fcntl.flock(self._file, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc):
+        if fcntl is not None:
+            fcntl.flock(self._file, fcntl.LOCK_UN)
+        self._file.close()
@@ -0,0 +1,58 @@
+import threading
+import weakref
+import numpy as np
+from app.market.store import GrowableArray
+
+
+class ScaledWindows:
+    """Model-ready windows cut straight from a market snapshot.
+
+    The scaler is column-wise, so each snapshot's feature matrix is scaled once
+    and any 60-row window is then a slice of it. Entries are keyed weakly on the
+    snapshot and disappear when the store swaps in a reloaded one; a snapshot
+    made by appending rows extends its parent's matrices instead of rescaling.
+    """
+
+    def __init__(self, scaler, columns, length):
+        self.scaler = scaler
+        self.columns = list(columns)
+        self.length = length
+        self._matrices = weakref.WeakKeyDictionary()  # snapshot -> (raw, scaled, buffers)
+        self._lock = threading.Lock()
+
+    def _features(self, snapshot, start=0):
+        return np.column_stack([snapshot.columns[name][start:] for name in self.columns]).astype(np.float64)
+
+    def _extend(self, snapshot):
+        """Parent's matrices plus the appended rows, or None if the parent has none cached."""
+        parent = snapshot.parent() if snapshot.parent is not None else None
+        entry = self._matrices.get(parent) if parent is not None else None
+        if entry is None:
+            return None
+        raw, scaled, buffers = entry
+        if buffers is None or buffers[0].size != len(raw):
+            # Not extended yet, or a sibling snapshot already grew the buffers past this one
+            buffers = (GrowableArray(raw), GrowableArray(scaled))
+            self._matrices[parent] = (raw, scaled, buffers)
+        new_raw = self._features(snapshot, len(parent))
+        return buffers[0].extend(new_raw), buffers[1].extend(self.scaler.transform(new_raw)), buffers
+
+    def matrices(self, snapshot):
+        """(raw, scaled) feature matrices covering the whole snapshot."""
+        with self._lock:
+            entry = self._matrices.get(snapshot)
+            if entry is None:
+                entry = self._extend(snapshot)
+                if entry is None:
+                    raw = self._features(snapshot)
+                    entry = (raw, self.scaler.transform(raw), None)
+                self._matrices[snapshot] = entry
+            return entry[0], entry[1]
+
+    def window(self, snapshot, as_of=None):
+        """(raw, scaled) windows ending on or before `as_of`, or None if there is not enough history."""
+        end = snapshot.index_of(as_of)
+        if end < self.length:
+            return None
+        raw, scaled = self.matrices(snapshot)
+        return raw[end - self.length:end], scaled[end - self.length:end]
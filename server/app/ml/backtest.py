@@ -0,0 +1,97 @@
+"""Rolling-origin backtest of the LSTM -> XGBoost -> inverse-scaler forecaster.
+
+Every origin is a 60-day window of the dataset; the forecast made from it is
+compared with the Close prices that actually followed. All origins are rolled
+forward together as batched tensors.
+
+Run from server/:  python -m app.ml.backtest [--stride 1] [--window 500] [--output report.json]
+"""
+import argparse
+import json
+import time
+import numpy as np
+from app import config
+from app.ml.rollout import CLOSE_INDEX, FEATURE_COLUMNS, HORIZON, SEQUENCE_LENGTH
+
+
+def origin_ends(n_rows, horizon, stride=1, window=None):
+    """Exclusive end rows of every origin that has `horizon` observed days after it."""
+    ends = np.arange(SEQUENCE_LENGTH, n_rows - horizon + 1)
+    if window is not None:
+        ends = ends[-window:]
+    # Anchor the stride on the latest origin so runs over a growing dataset stay comparable
+    return ends[::-1][::stride][::-1]
+
+
+def backtest(engine, snapshot, scaled_windows, horizon=HORIZON, stride=1, window=None, batch_size=512):
+    raw, scaled = scaled_windows.matrices(snapshot)
+    ends = origin_ends(len(raw), horizon, stride, window)
+    if len(ends) == 0:
+        raise ValueError(f"Dataset has too few rows for a {SEQUENCE_LENGTH}+{horizon} day backtest")
+
+    all_windows = np.lib.stride_tricks.sliding_window_view(scaled, (SEQUENCE_LENGTH, scaled.shape[1]))[:, 0]
+    started = time.perf_counter()
+    predicted = engine.forecast_batch(all_windows[ends - SEQUENCE_LENGTH], horizon, batch_size=batch_size)
+    elapsed = time.perf_counter() - started
+
+    # actual[i, k] = Close on the k-th trading day after origin i
+    actual = raw[ends[:, None] + np.arange(horizon)[None, :], CLOSE_INDEX]
+    errors = predicted - actual
+    mae = np.abs(errors).mean(axis=0)
+    mape = 100 * (np.abs(errors) / np.abs(actual)).mean(axis=0)
+
+    return {
+        "origins": int(len(ends)),
+        "first_origin": str(snapshot.dates[ends[0] - 1]),
+        "last_origin": str(snapshot.dates[ends[-1] - 1]),
+        "horizon": horizon,
+        "stride": stride,
+        "mae": mae.round(6).tolist(),
+        "mape": mape.round(6).tolist(),
+        "mae_mean": round(float(mae.mean()), 6),
+        "mape_mean": round(float(mape.mean()), 6),
+        "seconds": round(elapsed, 3),
+        "windows_per_sec": round(len(ends) / elapsed, 1) if elapsed else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rolling-origin backtest over the market dataset.")
+    parser.add_argument("--symbol", default=config.MARKET_DATA_SYMBOL)
+    parser.add_argument("--stride", type=int, default=1, help="trading days between origins")
+    parser.add_argument("--window", type=int, default=None, help="only the most recent N origins")
+    parser.add_argument("--horizon", type=int, default=HORIZON)
+    parser.add_argument("--batch-size", type=int, default=512)
+    parser.add_argument("--backend", choices=["keras", "numpy"], default=config.INFERENCE_BACKEND)
+    parser.add_argument("--output", help="write the JSON report here as well")
+    args = parser.parse_args()
+
+    from app.market.store import MarketDataStore
+    from app.market.windows import ScaledWindows
+    from app.ml.models import load_rollout_engine, model_version
+
+    symbol = args.symbol.upper()
+    if symbol not in config.MARKET_DATASETS:
+        parser.error(f"unknown symbol {symbol}; configured: {', '.join(sorted(config.MARKET_DATASETS))}")
+    snapshot = MarketDataStore(config.MARKET_DATASETS[symbol]).snapshot()
+    engine = load_rollout_engine(args.backend)
+    scaled_windows = ScaledWindows(engine.scaler, FEATURE_COLUMNS, SEQUENCE_LENGTH)
+
+    result = backtest(engine, snapshot, scaled_windows, args.horizon, args.stride, args.window, args.batch_size)
+    # Everything needed to reproduce and compare the run
+    report = {
+        "symbol": symbol,
+        "backend": args.backend,
+        "model_version": model_version(),
+        "dataset_signature": snapshot.signature,
+        **result,
+    }
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    print(f"✅ {report['origins']} origins in {report['seconds']}s ({report['windows_per_sec']} windows/sec)")
+
+
+if __name__ == "__main__":
+    main()
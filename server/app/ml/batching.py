@@ -0,0 +1,134 @@
+import asyncio
+import time
+import numpy as np
+
+
+class BatchStats:
+    """Running batch-size and queue-wait counters for the scheduler."""
+
+    # Upper bounds of the batch-size histogram buckets
+    SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+
+    def __init__(self):
+        self.batches = 0
+        self.items = 0
+        self.max_batch_size = 0
+        self.total_wait_s = 0.0
+        self.total_infer_s = 0.0
+        self.size_histogram = {bound: 0 for bound in self.SIZE_BUCKETS}
+        self.size_histogram["+Inf"] = 0
+
+    def record(self, size, wait_s, infer_s):
+        self.batches += 1
+        self.items += size
+        self.max_batch_size = max(self.max_batch_size, size)
+        self.total_wait_s += wait_s
+        self.total_infer_s += infer_s
+        for bound in self.SIZE_BUCKETS:
+            if size <= bound:
+                self.size_histogram[bound] += 1
+                break
+        else:
+            self.size_histogram["+Inf"] += 1
+
+    def snapshot(self):
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "mean_batch_size": self.items / self.batches if self.batches else 0.0,
+            "max_batch_size": self.max_batch_size,
+            "mean_queue_wait_ms": 1000 * self.total_wait_s / self.items if self.items else 0.0,
+            "mean_batch_infer_ms": 1000 * self.total_infer_s / self.batches if self.batches else 0.0,
+            "batch_size_histogram": {str(k): v for k, v in self.size_histogram.items()},
+        }
+
+
+class BatchScheduler:
+    """Collects single-window rollout steps from concurrent requests into one batched call.
+
+    A step waits at most `max_wait_ms` for companions, and only while other steps
+    are in flight: a lone request is flushed at once. A batch is also flushed as
+    soon as it reaches `max_batch_size`. `infer_fn` receives a (B, 60, 7) array
+    and returns B scaled Close predictions; it runs through `call(fn, *args)`,
+    e.g. InferencePool.call (the loop's default executor if None).
+    """
+
+    def __init__(self, infer_fn, max_batch_size=64, max_wait_ms=2.0, call=None):
+        self.infer_fn = infer_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait_s = max_wait_ms / 1000.0
+        self.call = call
+        self.stats = BatchStats()
+        self._queue = None
+        self._worker = None
+        self._in_flight = 0  # submitted steps not yet answered, including queued ones
+
+    def _ensure_started(self):
+        # Started lazily so the queue and worker bind to the serving event loop
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    async def submit(self, window):
+        """Queue one scaled (60, 7) window and wait for its prediction."""
+        self._ensure_started()
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight += 1
+        try:
+            # Copy now: the caller's ring is mutated as soon as the result comes back
+            await self._queue.put((np.array(window, dtype=np.float32), future, time.perf_counter()))
+            return await future
+        finally:
+            self._in_flight -= 1
+
+    async def stop(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+    async def _collect(self):
+        batch = [await self._queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_wait_s
+        while len(batch) < self.max_batch_size:
+            # Drain whatever is already queued without yielding
+            while len(batch) < self.max_batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            remaining = deadline - loop.time()
+            # Nobody else has a step outstanding, so waiting cannot grow the batch
+            if len(batch) >= min(self.max_batch_size, self._in_flight) or remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            windows = np.stack([window for window, _, _ in batch])
+            started = time.perf_counter()
+            try:
+                if self.call is not None:
+                    preds = await self.call(self.infer_fn, windows)
+                else:
+                    preds = await loop.run_in_executor(None, self.infer_fn, windows)
+            except Exception as e:
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            finished = time.perf_counter()
+
+            wait_s = sum(started - queued_at for _, _, queued_at in batch)
+            self.stats.record(len(batch), wait_s, finished - started)
+            for (_, future, _), pred in zip(batch, preds):
+                # The request may have been cancelled while the batch was running
+                if not future.done():
+                    future.set_result(float(pred))
@@ -0,0 +1,90 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from app.core.metrics import REGISTRY, capture_observations
+
+
+class PoolSaturated(Exception):
+    """Raised when the inference pool already holds `max_pending` jobs."""
+
+    def __init__(self, retry_after):
+        super().__init__("Inference queue is full")
+        self.retry_after = retry_after
+
+
+def _run_captured(fn, *args):
+    # Worker side: stage timings travel back with the result
+    with capture_observations() as observations:
+        result = fn(*args)
+    return result, observations
+
+
+class InferencePool:
+    """Dedicated executor for blocking model inference with a bounded backlog.
+
+    `kind` is "thread" or "process". At most `max_pending` jobs (running + queued)
+    are admitted; beyond that callers get PoolSaturated instead of an ever-growing
+    queue. Admission is tracked on the event loop, so no lock is needed. Metrics
+    observed in process workers are returned with each result and recorded here.
+    """
+
+    def __init__(self, kind="thread", max_workers=2, max_pending=32, retry_after=1, initializer=None):
+        if kind == "process":
+            # spawn: forking a process that already holds TensorFlow state is unsafe
+            self._executor = ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=initializer,
+            )
+        elif kind == "thread":
+            self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="inference")
+        else:
+            raise ValueError(f"Unknown inference executor kind: {kind!r}")
+        self.kind = kind
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.retry_after = retry_after
+        self.pending = 0
+        self.rejected = 0
+
+    @property
+    def executor(self):
+        return self._executor
+
+    @asynccontextmanager
+    async def slot(self):
+        """Reserve one backlog slot for the duration of a job, or raise PoolSaturated."""
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise PoolSaturated(self.retry_after)
+        self.pending += 1
+        try:
+            yield
+        finally:
+            self.pending -= 1
+
+    async def call(self, fn, *args):
+        """Run `fn(*args)` on the pool without taking a backlog slot (the caller holds one)."""
+        loop = asyncio.get_running_loop()
+        if self.kind != "process":
+            return await loop.run_in_executor(self._executor, fn, *args)
+        result, observations = await loop.run_in_executor(self._executor, _run_captured, fn, *args)
+        REGISTRY.replay(observations)
+        return result
+
+    async def run(self, fn, *args):
+        async with self.slot():
+            return await self.call(fn, *args)
+
+    def stats(self):
+        return {
+            "executor": self.kind,
+            "workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "pending": self.pending,
+            "rejected": self.rejected,
+        }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
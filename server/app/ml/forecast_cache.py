@@ -0,0 +1,66 @@
+import hashlib
+import os
+import pickle
+import numpy as np
+from app.core.lru import LRUCache
+
+
+def _sizeof(key, predictions):
+    # Key string + tuple header + one boxed float per horizon day
+    return len(key) + 56 + 32 * len(predictions)
+
+
+class ForecastCache:
+    """Forecasts keyed by a hash of the raw input matrix, horizon and model version.
+
+    Entries live in a byte-bounded LRU with TTL. If `persist_path` is set the live
+    entries are pickled on save() and restored on load(), skipping anything
+    produced by a different model version. Models are only loaded at startup, so
+    that version check on restart is what invalidates entries after a model change.
+    """
+
+    def __init__(self, version, max_bytes=8 * 1024 * 1024, ttl=3600, persist_path=None):
+        self.version = version
+        self.persist_path = persist_path
+        self._lru = LRUCache(max_bytes=max_bytes, ttl=ttl, sizeof=_sizeof)
+
+    def key(self, matrix, horizon):
+        matrix = np.ascontiguousarray(matrix, dtype=np.float64)
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(self.version.encode())
+        digest.update(np.asarray(matrix.shape + (horizon,), dtype=np.int64).tobytes())
+        digest.update(matrix.tobytes())
+        return digest.hexdigest()
+
+    def get(self, matrix, horizon):
+        predictions = self._lru.get(self.key(matrix, horizon))
+        return list(predictions) if predictions is not None else None
+
+    def put(self, matrix, horizon, predictions):
+        self._lru.set(self.key(matrix, horizon), tuple(predictions))
+
+    def load(self):
+        if not self.persist_path or not os.path.exists(self.persist_path):
+            return 0
+        try:
+            with open(self.persist_path, "rb") as f:
+                saved = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError) as e:
+            print(f"⚠️ Ignoring unreadable forecast cache: {e}")
+            return 0
+        if saved.get("version") != self.version:
+            return 0
+        for key, predictions, expires_at in saved["entries"]:
+            self._lru.set(key, predictions, expires_at=expires_at)
+        return len(self._lru)
+
+    def save(self):
+        if not self.persist_path:
+            return
+        tmp = self.persist_path + ".tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump({"version": self.version, "entries": self._lru.items()}, f)
+        os.replace(tmp, self.persist_path)
+
+    def stats(self):
+        return {"model_version": self.version, **self._lru.stats()}
@@ -0,0 +1,167 @@
+"""Batch forecast materialization.
+
+Computes the n-day forecast for every 60-day window of each configured dataset
+in large vectorized batches and writes one compact, versioned .npz per symbol.
+The API serves these read-through and only runs live inference on a miss.
+Once rows are appended to a dataset, a rerun only forecasts the new windows.
+
+Run from server/:  python -m app.ml.materialize [--symbols DEFAULT] [--batch-size 512] [--full]
+"""
+import argparse
+import os
+import threading
+import time
+import numpy as np
+from app import config
+from app.ml.rollout import FEATURE_COLUMNS, HORIZON, SEQUENCE_LENGTH
+
+FORMAT_VERSION = 3
+
+
+def forecast_path(out_dir, symbol):
+    return os.path.join(out_dir, f"{symbol}.npz")
+
+
+def _existing(path, version, snapshot, horizon):
+    """(as_of, predictions) of a file this snapshot extends, or None."""
+    try:
+        with np.load(path) as data:
+            if (int(data["format_version"]) != FORMAT_VERSION or str(data["model_version"]) != version
+                    or data["base"].tolist() != list(snapshot.base) or int(data["horizon"]) != horizon
+                    or int(data["rows"]) > len(snapshot)):
+                return None
+            return data["as_of"], data["predictions"]
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def materialize_symbol(engine, store, scaled_windows, symbol, version, out_dir, horizon=HORIZON, batch_size=512,
+                       incremental=True):
+    """Forecast every window of one dataset into `<out_dir>/<symbol>.npz`; returns the number of new forecasts.
+
+    With `incremental`, a file written for an earlier state of the same dataset
+    (same base load, fewer rows appended) is kept and only the windows ending on
+    the appended rows are forecast.
+    """
+    snapshot = store.snapshot()
+    if len(snapshot) < SEQUENCE_LENGTH:
+        return 0
+    path = forecast_path(out_dir, symbol)
+    existing = _existing(path, version, snapshot, horizon) if incremental else None
+    done = len(existing[1]) if existing is not None else 0
+    if done == len(snapshot) - SEQUENCE_LENGTH + 1:
+        return 0
+    _, scaled = scaled_windows.matrices(snapshot)
+    # (N - 59, 60, 7) view over the scaled matrix: row k is the window ending at row k + 59
+    windows = np.lib.stride_tricks.sliding_window_view(scaled, (SEQUENCE_LENGTH, scaled.shape[1]))[:, 0]
+    # float64 like the live path, so a materialized hit returns the same numbers
+    predictions = np.asarray(engine.forecast_batch(windows[done:], horizon, batch_size=batch_size), dtype=np.float64)
+    as_of = snapshot.dates[SEQUENCE_LENGTH - 1:].view("<i8")
+    if existing is not None:
+        predictions = np.concatenate((existing[1], predictions))
+
+    os.makedirs(out_dir, exist_ok=True)
+    tmp = path + ".tmp.npz"
+    np.savez_compressed(
+        tmp,
+        format_version=np.int64(FORMAT_VERSION),
+        model_version=np.array(version),
+        base=np.asarray(snapshot.base, dtype=np.int64),
+        rows=np.int64(len(snapshot)),
+        horizon=np.int64(horizon),
+        as_of=as_of,
+        predictions=predictions,
+    )
+    os.replace(tmp, path)
+    return len(predictions) - done
+
+
+class MaterializedForecasts:
+    """Read-through view of the materialized forecast files.
+
+    A file is used only if it was produced by the current model version from the
+    dataset being served: the same base load, and only for windows ending on rows
+    it covered. Rows appended since then are misses until the next run.
+    """
+
+    def __init__(self, out_dir, version):
+        self.out_dir = out_dir
+        self.version = version
+        self._files = {}  # symbol -> (mtime_ns, base, rows, {as_of_day: row}, predictions)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _load(self, symbol):
+        path = forecast_path(self.out_dir, symbol)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+        cached = self._files.get(symbol)
+        if cached is not None and cached[0] == mtime:
+            return cached
+        with self._lock, np.load(path) as data:
+            if int(data["format_version"]) != FORMAT_VERSION or str(data["model_version"]) != self.version:
+                entry = (mtime, None, 0, {}, None)
+            else:
+                rows = {int(day): i for i, day in enumerate(data["as_of"])}
+                entry = (mtime, data["base"].tolist(), int(data["rows"]), rows, data["predictions"])
+            self._files[symbol] = entry
+            return entry
+
+    def lookup(self, symbol, snapshot, end):
+        """Precomputed forecast for the window ending at row `end` (exclusive), or None."""
+        entry = self._load(symbol) if end > 0 else None
+        if entry is not None and entry[1] == list(snapshot.base) and end <= entry[2]:
+            row = entry[3].get(int(snapshot.dates[end - 1].view("<i8")))
+            if row is not None:
+                self.hits += 1
+                return entry[4][row].tolist()
+        self.misses += 1
+        return None
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "symbols": sorted(self._files)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Materialize forecasts for every dataset window.")
+    parser.add_argument("--symbols", nargs="+", default=sorted(config.MARKET_DATASETS),
+                        help="symbols from MARKET_DATASETS (default: all)")
+    parser.add_argument("--out-dir", default=config.FORECAST_STORE_DIR)
+    parser.add_argument("--batch-size", type=int, default=512)
+    parser.add_argument("--backend", choices=["keras", "numpy"], default=config.INFERENCE_BACKEND)
+    parser.add_argument("--full", action="store_true", help="recompute every window, not just appended ones")
+    args = parser.parse_args()
+
+    from app.market.store import MarketDataStore
+    from app.market.windows import ScaledWindows
+    from app.ml.models import load_rollout_engine, model_version
+
+    started = time.perf_counter()
+    engine = load_rollout_engine(args.backend)
+    version = model_version()
+    scaled_windows = ScaledWindows(engine.scaler, FEATURE_COLUMNS, SEQUENCE_LENGTH)
+    print(f"Loaded models ({args.backend}, version {version}) in {time.perf_counter() - started:.2f}s")
+
+    total_rows = 0
+    for symbol in args.symbols:
+        symbol = symbol.upper()
+        if symbol not in config.MARKET_DATASETS:
+            print(f"⚠️ Skipping unknown symbol {symbol}")
+            continue
+        store = MarketDataStore(config.MARKET_DATASETS[symbol])
+        symbol_started = time.perf_counter()
+        rows = materialize_symbol(engine, store, scaled_windows, symbol, version, args.out_dir,
+                                  batch_size=args.batch_size, incremental=not args.full)
+        elapsed = time.perf_counter() - symbol_started
+        total_rows += rows
+        print(f"{symbol}: {rows} windows in {elapsed:.2f}s ({rows / elapsed if elapsed else 0:.1f} rows/sec)")
+
+    wall = time.perf_counter() - started
+    print(f"✅ Materialized {total_rows} forecasts in {wall:.2f}s wall ({total_rows / wall:.1f} rows/sec)")
+
+
+if __name__ == "__main__":
+    main()
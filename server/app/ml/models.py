@@ -0,0 +1,70 @@
+import hashlib
+from app import config
+from app.ml.rollout import RolloutEngine, compile_feature_extractor
+
+LSTM_MODEL_PATH = "app/models/lstm_model.h5"
+XGB_MODEL_PATH = "app/models/xgb_model.pkl"
+SCALER_PATH = "app/models/scaler.pkl"
+MODEL_PATHS = (LSTM_MODEL_PATH, XGB_MODEL_PATH, SCALER_PATH)
+
+
+def model_version(paths=MODEL_PATHS):
+    """Content hash of the model artifacts; any retrained file yields a new version."""
+    digest = hashlib.blake2b(digest_size=12)
+    for path in paths:
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def load_feature_extractor(backend="keras"):
+    """LSTM feature extractor (penultimate layer) for the selected inference backend."""
+    if backend == "numpy":
+        from app.ml.numpy_lstm import NumpyLSTMFeatures
+        return NumpyLSTMFeatures.load_or_export(LSTM_MODEL_PATH)
+    if backend != "keras":
+        raise ValueError(f"Unknown inference backend: {backend!r}")
+
+    from tensorflow.keras.models import load_model, Model
+    lstm_model = load_model(LSTM_MODEL_PATH)
+
+    # Create intermediate LSTM model to extract features
+    intermediate_model = Model(inputs=lstm_model.input, outputs=lstm_model.layers[-2].output)
+    return compile_feature_extractor(intermediate_model)
+
+
+def load_rollout_engine(backend=None):
+    """Load the LSTM features, XGBoost model and scaler and wrap them in a RolloutEngine."""
+    import joblib
+
+    xgb_model = joblib.load(XGB_MODEL_PATH)
+    scaler = joblib.load(SCALER_PATH)
+    return RolloutEngine(load_feature_extractor(backend or config.INFERENCE_BACKEND), xgb_model, scaler)
+
+
+# Entry points for process-pool workers: each process loads its own copy of the models once
+_process_engine = None
+
+
+def _engine():
+    global _process_engine
+    if _process_engine is None:
+        _process_engine = load_rollout_engine()
+    return _process_engine
+
+
+def warm_process_worker():
+    _engine()
+
+
+def process_forecast_scaled(scaled_window, horizon):
+    return _engine().forecast_scaled(scaled_window, horizon)
+
+
+def process_predict_batch(windows):
+    return _engine().predict_batch(windows)
+
+
+def process_scenario_bands(scaled_window, n, noise, horizon, seed):
+    from app.ml.scenarios import scenario_bands
+    return scenario_bands(_engine(), scaled_window, n, noise=noise, horizon=horizon, seed=seed)
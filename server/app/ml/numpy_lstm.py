@@ -0,0 +1,135 @@
+import json
+import os
+import numpy as np
+
+# Layers the NumPy forward pass knows how to run (Dropout is the identity at inference)
+SUPPORTED_LAYERS = ("InputLayer", "LSTM", "Dense", "Dropout")
+
+
+def _sigmoid(x):
+    return 1.0 / (1.0 + np.exp(-x))
+
+
+ACTIVATIONS = {
+    "tanh": np.tanh,
+    "sigmoid": _sigmoid,
+    "relu": lambda x: np.maximum(x, 0),
+    "linear": lambda x: x,
+}
+
+
+class NumpyLSTMFeatures:
+    """Keras LSTM/Dense stack evaluated in vectorized NumPy, up to a chosen output layer.
+
+    Mirrors `Model(inputs=lstm_model.input, outputs=lstm_model.layers[-2].output)`
+    without importing TensorFlow: weights are exported once from the .h5 file to
+    an .npz next to it and loaded from there afterwards.
+    """
+
+    def __init__(self, layers):
+        # layers: list of (class_name, config, [weights...]) in forward order
+        self.layers = layers
+
+    @classmethod
+    def from_h5(cls, h5_path, output_layer=-2):
+        import h5py
+
+        with h5py.File(h5_path, "r") as f:
+            raw_config = f.attrs["model_config"]
+            model_config = json.loads(raw_config.decode() if isinstance(raw_config, bytes) else raw_config)
+            layer_configs = model_config["config"]["layers"]
+            # Keep everything up to and including the requested output layer
+            stop = output_layer % len(layer_configs) + 1
+            layer_configs = layer_configs[:stop]
+
+            layers = []
+            for layer in layer_configs:
+                kind, config = layer["class_name"], layer["config"]
+                if kind not in SUPPORTED_LAYERS:
+                    raise ValueError(f"NumPy backend cannot run layer {config['name']!r} of type {kind}")
+                weights = []
+                group = f["model_weights"].get(config["name"])
+                if group is not None:
+                    names = [n.decode() if isinstance(n, bytes) else n for n in group.attrs.get("weight_names", [])]
+                    weights = [np.asarray(group[name], dtype=np.float32) for name in names]
+                layers.append((kind, config, weights))
+        return cls(layers)
+
+    def save(self, npz_path):
+        arrays = {}
+        spec = []
+        for i, (kind, config, weights) in enumerate(self.layers):
+            spec.append({"class_name": kind, "config": config, "weights": len(weights)})
+            for j, w in enumerate(weights):
+                arrays[f"layer{i}_w{j}"] = w
+        np.savez(npz_path, spec=np.array(json.dumps(spec)), **arrays)
+
+    @classmethod
+    def load(cls, npz_path):
+        with np.load(npz_path) as data:
+            spec = json.loads(str(data["spec"]))
+            layers = [
+                (entry["class_name"], entry["config"], [data[f"layer{i}_w{j}"] for j in range(entry["weights"])])
+                for i, entry in enumerate(spec)
+            ]
+        return cls(layers)
+
+    @classmethod
+    def load_or_export(cls, h5_path, npz_path=None, output_layer=-2):
+        """Use the exported .npz if it is newer than the .h5, otherwise re-export it."""
+        npz_path = npz_path or os.path.splitext(h5_path)[0] + "_features.npz"
+        if os.path.exists(npz_path) and os.path.getmtime(npz_path) >= os.path.getmtime(h5_path):
+            return cls.load(npz_path)
+        features = cls.from_h5(h5_path, output_layer=output_layer)
+        try:
+            features.save(npz_path)
+        except OSError as e:
+            print(f"⚠️ Could not cache exported LSTM weights: {e}")
+        return features
+
+    @property
+    def output_dim(self):
+        for kind, config, _ in reversed(self.layers):
+            if "units" in config:
+                return config["units"]
+        return None
+
+    def __call__(self, batch):
+        x = np.asarray(batch, dtype=np.float32)
+        for kind, config, weights in self.layers:
+            if kind == "LSTM":
+                x = self._lstm(x, config, weights)
+            elif kind == "Dense":
+                kernel, bias = weights if config.get("use_bias", True) else (weights[0], 0)
+                x = ACTIVATIONS[config["activation"]](x @ kernel + bias)
+        return x
+
+    @staticmethod
+    def _lstm(x, config, weights):
+        kernel, recurrent_kernel = weights[0], weights[1]
+        bias = weights[2] if config.get("use_bias", True) else 0
+        units = config["units"]
+        activation = ACTIVATIONS[config["activation"]]
+        recurrent_activation = ACTIVATIONS[config["recurrent_activation"]]
+
+        batch_size, steps, _ = x.shape
+        if config.get("go_backwards"):
+            x = x[:, ::-1]
+        # Input projections for every timestep in one matmul; only h @ U stays in the loop
+        projected = x @ kernel + bias
+        h = np.zeros((batch_size, units), dtype=np.float32)
+        c = np.zeros((batch_size, units), dtype=np.float32)
+        outputs = np.empty((batch_size, steps, units), dtype=np.float32) if config.get("return_sequences") else None
+
+        for t in range(steps):
+            z = projected[:, t] + h @ recurrent_kernel
+            # Keras gate order: input, forget, cell candidate, output
+            i = recurrent_activation(z[:, :units])
+            f = recurrent_activation(z[:, units:2 * units])
+            g = activation(z[:, 2 * units:3 * units])
+            o = recurrent_activation(z[:, 3 * units:])
+            c = f * c + i * g
+            h = o * activation(c)
+            if outputs is not None:
+                outputs[:, t] = h
+        return outputs if outputs is not None else h
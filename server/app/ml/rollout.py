@@ -0,0 +1,168 @@
+import threading
+import numpy as np
+from app.core.metrics import stage
+
+# Model configuration shared by every caller of the forecaster
+SEQUENCE_LENGTH = 60
+N_FEATURES = 7
+FEATURE_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Adj close', 'Volume', 'Scaled_sentiment']
+CLOSE_INDEX = 3  # position of 'Close' in FEATURE_COLUMNS
+HORIZON = 30
+
+
+def compile_feature_extractor(intermediate_model, sequence_length=SEQUENCE_LENGTH, n_features=N_FEATURES):
+    """Trace the Keras feature extractor once so each step is a plain graph call instead of .predict()."""
+    import tensorflow as tf
+
+    @tf.function(
+        input_signature=[tf.TensorSpec(shape=(None, sequence_length, n_features), dtype=tf.float32)],
+        reduce_retracing=True,
+    )
+    def forward(batch):
+        return intermediate_model(batch, training=False)
+
+    def feature_fn(batch):
+        return forward(tf.convert_to_tensor(batch, dtype=tf.float32)).numpy()
+
+    return feature_fn
+
+
+class RingWindow:
+    """Fixed-size sliding window over a preallocated ring of length 2*sequence_length.
+
+    Every pushed row is written twice, so the current window is always one
+    contiguous slice and no per-step vstack/copy is needed.
+    """
+
+    def __init__(self, sequence_length=SEQUENCE_LENGTH, n_features=N_FEATURES, target_index=CLOSE_INDEX):
+        self.sequence_length = sequence_length
+        self.target_index = target_index
+        self._ring = np.empty((2 * sequence_length, n_features), dtype=np.float32)
+        self._template = np.empty(n_features, dtype=np.float32)
+        self._head = 0
+
+    def reset(self, scaled_window):
+        length = self.sequence_length
+        self._ring[:length] = scaled_window
+        self._ring[length:] = scaled_window
+        # Each appended row is a copy of the last observed row with only Close replaced
+        self._template[:] = self._ring[length - 1]
+        self._head = 0
+
+    def view(self):
+        return self._ring[self._head:self._head + self.sequence_length]
+
+    def push(self, target_value):
+        # Overwrite the oldest slot (and its mirror) with the new row
+        self._template[self.target_index] = target_value
+        self._ring[self._head] = self._template
+        self._ring[self._head + self.sequence_length] = self._template
+        self._head = (self._head + 1) % self.sequence_length
+
+
+class RolloutEngine:
+    """Autoregressive N-day rollout of LSTM features -> XGBoost -> inverse scaling.
+
+    Windows are kept in a RingWindow; the synchronous path reuses one per thread
+    so the engine can be shared by concurrent workers.
+    """
+
+    def __init__(self, feature_fn, regressor, scaler,
+                 sequence_length=SEQUENCE_LENGTH, n_features=N_FEATURES, target_index=CLOSE_INDEX):
+        self.feature_fn = feature_fn
+        self.regressor = regressor
+        self.scaler = scaler
+        self.sequence_length = sequence_length
+        self.n_features = n_features
+        self.target_index = target_index
+        self._local = threading.local()
+
+    def new_window(self):
+        return RingWindow(self.sequence_length, self.n_features, self.target_index)
+
+    def _thread_window(self):
+        window = getattr(self._local, "window", None)
+        if window is None:
+            window = self._local.window = self.new_window()
+        return window
+
+    def scale(self, raw_window):
+        with stage("scale"):
+            return self.scaler.transform(np.asarray(raw_window, dtype=np.float64))
+
+    def unscale(self, scaled_targets):
+        # The scaler works column-wise, so one (horizon, n_features) pass replaces a dummy row per step
+        scaled_targets = np.asarray(scaled_targets, dtype=np.float64)
+        padded = np.zeros((scaled_targets.shape[0], self.n_features))
+        padded[:, self.target_index] = scaled_targets
+        with stage("inverse_transform"):
+            return self.scaler.inverse_transform(padded)[:, self.target_index]
+
+    def predict_batch(self, windows):
+        """One LSTM + XGBoost step for a (B, 60, 7) batch of scaled windows."""
+        with stage("lstm"):
+            features = self.feature_fn(windows)
+        with stage("xgboost"):
+            return self.regressor.predict(features)
+
+    def rollout(self, scaled_window, horizon):
+        """Run `horizon` steps from an already scaled window and return the scaled predictions."""
+        window = self._thread_window()
+        window.reset(scaled_window)
+        scaled_preds = np.empty(horizon, dtype=np.float64)
+        for step in range(horizon):
+            pred = self.predict_batch(window.view()[np.newaxis])[0]
+            scaled_preds[step] = pred
+            window.push(pred)
+        return scaled_preds
+
+    def rollout_batch(self, scaled_windows, horizon, batch_size=512):
+        """Vectorized rollout of many independent windows: (B, 60, 7) -> (B, horizon) scaled predictions.
+
+        Every step runs one LSTM + XGBoost call per chunk of `batch_size` windows.
+        """
+        scaled_windows = np.asarray(scaled_windows)
+        length = self.sequence_length
+        scaled_preds = np.empty((len(scaled_windows), horizon), dtype=np.float64)
+        for start in range(0, len(scaled_windows), batch_size):
+            chunk = scaled_windows[start:start + batch_size]
+            ring = np.empty((len(chunk), 2 * length, self.n_features), dtype=np.float32)
+            ring[:, :length] = chunk
+            ring[:, length:] = chunk
+            template = ring[:, length - 1].copy()
+            for step in range(horizon):
+                head = step % length
+                preds = self.predict_batch(ring[:, head:head + length])
+                scaled_preds[start:start + len(chunk), step] = preds
+                template[:, self.target_index] = preds
+                ring[:, head] = template
+                ring[:, head + length] = template
+        return scaled_preds
+
+    def forecast_batch(self, scaled_windows, horizon, batch_size=512):
+        """Un-scaled (B, horizon) Close forecasts for a batch of scaled windows."""
+        scaled_preds = self.rollout_batch(scaled_windows, horizon, batch_size)
+        return self.unscale(scaled_preds.ravel()).reshape(scaled_preds.shape)
+
+    async def rollout_async(self, scaled_window, horizon, step_fn):
+        """Same as rollout(), but each step is awaited through `step_fn(window) -> scaled Close`."""
+        # Coroutines share a thread, so each call gets its own ring
+        window = self.new_window()
+        window.reset(scaled_window)
+        scaled_preds = np.empty(horizon, dtype=np.float64)
+        for step in range(horizon):
+            pred = await step_fn(window.view())
+            scaled_preds[step] = pred
+            window.push(pred)
+        return scaled_preds
+
+    def forecast(self, raw_window, horizon=HORIZON):
+        """Scale a raw 60x7 window, roll it forward and return un-scaled Close prices."""
+        return self.forecast_scaled(self.scale(raw_window), horizon)
+
+    def forecast_scaled(self, scaled_window, horizon=HORIZON):
+        return self.unscale(self.rollout(scaled_window, horizon)).tolist()
+
+    async def forecast_scaled_async(self, scaled_window, horizon, step_fn):
+        scaled_preds = await self.rollout_async(scaled_window, horizon, step_fn)
+        return self.unscale(scaled_preds).tolist()
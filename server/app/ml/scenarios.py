@@ -0,0 +1,29 @@
+import numpy as np
+from app.ml.rollout import FEATURE_COLUMNS, HORIZON
+
+# Features perturbed by default: traded volume and news sentiment
+NOISY_COLUMNS = (FEATURE_COLUMNS.index('Volume'), FEATURE_COLUMNS.index('Scaled_sentiment'))
+PERCENTILES = (5, 25, 50, 75, 95)
+
+
+def perturbed_windows(scaled_window, n, noise=0.05, columns=NOISY_COLUMNS, seed=None):
+    """(n, 60, 7) copies of a scaled window with Gaussian noise on `columns`.
+
+    Noise is relative to each column's spread over the window, so a flat feature
+    stays flat and a volatile one gets proportionally wider perturbations.
+    """
+    rng = np.random.default_rng(seed)
+    scaled_window = np.asarray(scaled_window, dtype=np.float32)
+    windows = np.repeat(scaled_window[np.newaxis], n, axis=0)
+    columns = list(columns)
+    spread = scaled_window[:, columns].std(axis=0)
+    windows[:, :, columns] += rng.normal(0.0, 1.0, size=(n,) + scaled_window[:, columns].shape) * (noise * spread)
+    return windows
+
+
+def scenario_bands(engine, scaled_window, n, noise=0.05, horizon=HORIZON, seed=None, percentiles=PERCENTILES):
+    """Percentile bands of `n` perturbed rollouts, computed as one (n, 60, 7) batch per step."""
+    windows = perturbed_windows(scaled_window, n, noise=noise, seed=seed)
+    paths = engine.forecast_batch(windows, horizon, batch_size=n)
+    bands = np.percentile(paths, percentiles, axis=0)
+    return {f"p{p}": band.tolist() for p, band in zip(percentiles, bands)}
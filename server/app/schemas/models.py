@@ -38,6 +38,16 @@ class Settings(BaseModel):
     dark_mode: bool
     notifications: Optional[bool] = True
 
+class BulkUpdate(BaseModel):
+    profile: Optional[Profile] = None
+    watchlist: Optional[Watchlist] = None
+    settings: Optional[Settings] = None
+    assets: Optional[List[Asset]] = None
+    replace_assets: bool = False  # replace the asset list instead of appending to it
+
+class RefreshRequest(BaseModel):
+    refresh_token: str
+
 class User(BaseModel):
     username: str
     hashed_password: str
@@ -0,0 +1,66 @@
+"""Write-path benchmark: per-row asset writes vs. the single-operation bulk import.
+
+Run from server/:  python -m bench.bulk_writes [--assets 5000] [--uri mongodb://localhost:27017]
+
+Uses a scratch collection that is dropped afterwards. Compares:
+  legacy   - $setOnInsert upsert + $push per asset (the old POST /assets)
+  single   - one upserting $push per asset (the current POST /assets)
+  bulk     - one $push/$each for the whole import (POST /assets/bulk)
+"""
+import argparse
+import os
+import time
+from pymongo import MongoClient
+
+
+def sample_assets(count):
+    return [
+        {"name": f"Company {i}", "symbol": f"SYM{i}", "value": 100.0 + i, "percentage": 100.0 / count}
+        for i in range(count)
+    ]
+
+
+def legacy(collection, username, assets):
+    for asset in assets:
+        collection.update_one({"username": username}, {"$setOnInsert": {"username": username}}, upsert=True)
+        collection.update_one({"username": username}, {"$push": {"assets": asset}})
+    return 2 * len(assets)
+
+
+def single(collection, username, assets):
+    for asset in assets:
+        collection.update_one({"username": username}, {"$push": {"assets": asset}}, upsert=True)
+    return len(assets)
+
+
+def bulk(collection, username, assets):
+    collection.update_one({"username": username}, {"$push": {"assets": {"$each": assets}}}, upsert=True)
+    return 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark asset import write paths.")
+    parser.add_argument("--assets", type=int, default=5000)
+    parser.add_argument("--uri", default=os.getenv("MONGO_URI", "mongodb://localhost:27017"))
+    args = parser.parse_args()
+
+    client = MongoClient(args.uri)
+    collection = client["stockAI_bench"]["bulk_writes"]
+    assets = sample_assets(args.assets)
+    try:
+        for name, fn in (("legacy", legacy), ("single", single), ("bulk", bulk)):
+            collection.drop()
+            started = time.perf_counter()
+            ops = fn(collection, f"{name}@bench", assets)
+            elapsed = time.perf_counter() - started
+            stored = len(collection.find_one({"username": f"{name}@bench"}, {"assets": 1})["assets"])
+            assert stored == args.assets, f"{name}: stored {stored} of {args.assets} assets"
+            print(f"{name:>7}: {ops:6d} ops in {elapsed:7.3f}s  "
+                  f"{ops / elapsed:9.1f} ops/sec  {args.assets / elapsed:10.1f} assets/sec")
+    finally:
+        collection.drop()
+        client.close()
+
+
+if __name__ == "__main__":
+    main()
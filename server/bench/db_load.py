@@ -0,0 +1,93 @@
+"""Load test: blocking pymongo on a capped threadpool (the old handlers) vs. the async repository.
+
+Run from server/:  python -m bench.db_load [--requests 5000] [--concurrency 200] [--uri ...]
+
+Both paths run the same mix against a scratch collection: 80% projected user
+reads and 20% single-op asset pushes. "before" funnels calls through a
+40-thread pool, which is Starlette's default threadpool size for sync handlers.
+"""
+import argparse
+import asyncio
+import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pymongo import MongoClient
+
+STARLETTE_THREADPOOL = 40
+USERS = 500
+PROJECTION = {"password": 0, "assets": 0}
+
+
+def plan(requests, seed=0):
+    rng = random.Random(seed)
+    return [(rng.random() < 0.8, f"user{rng.randrange(USERS)}@bench") for _ in range(requests)]
+
+
+def seed_users(uri, db, name):
+    collection = MongoClient(uri)[db][name]
+    collection.drop()
+    collection.create_index("username", unique=True)
+    collection.insert_many([{"username": f"user{i}@bench", "email": f"user{i}@bench", "profile": {}, "assets": []}
+                            for i in range(USERS)])
+
+
+async def run_before(uri, db, name, ops, concurrency):
+    collection = MongoClient(uri, maxPoolSize=STARLETTE_THREADPOOL)[db][name]
+    pool = ThreadPoolExecutor(max_workers=STARLETTE_THREADPOOL)
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    def call(is_read, username):
+        if is_read:
+            return collection.find_one({"username": username}, PROJECTION)
+        return collection.update_one({"username": username}, {"$push": {"assets": {"symbol": "X"}}}, upsert=True)
+
+    async def one(op):
+        async with semaphore:
+            await loop.run_in_executor(pool, call, *op)
+
+    await asyncio.gather(*(one(op) for op in ops))
+    pool.shutdown()
+
+
+async def run_after(uri, db, name, ops, concurrency):
+    from app.db.connect import create_client
+    from app.db.repository import UserRepository
+
+    repo = UserRepository(create_client(uri)[db][name])
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(op):
+        is_read, username = op
+        async with semaphore:
+            if is_read:
+                await repo.find_by_username(username, PROJECTION)
+            else:
+                await repo.update(username, {"$push": {"assets": {"symbol": "X"}}})
+
+    await asyncio.gather(*(one(op) for op in ops))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare sync and async MongoDB access under load.")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--uri", default=os.getenv("MONGO_URI", "mongodb://localhost:27017"))
+    args = parser.parse_args()
+
+    db, name = "stockAI_bench", "db_load"
+    ops = plan(args.requests)
+    try:
+        for label, runner in (("before", run_before), ("after", run_after)):
+            seed_users(args.uri, db, name)
+            started = time.perf_counter()
+            asyncio.run(runner(args.uri, db, name, ops, args.concurrency))
+            elapsed = time.perf_counter() - started
+            print(f"{label:>6}: {args.requests} requests in {elapsed:.3f}s  {args.requests / elapsed:9.1f} req/s")
+    finally:
+        MongoClient(args.uri)[db][name].drop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+"""End-to-end load test: the real FastAPI app in-process, with local stand-ins for Mongo and Gemini.
+
+Run from server/:  python -m bench.load [--requests 2000] [--concurrency 50] [--output run.json]
+
+The app is driven over ASGI (no sockets) with MONGO_BACKEND=memory and
+LLM_BACKEND=fake, so the numbers cover routing, auth, validation, caches and
+inference, not the network. Requests follow a weighted mix of endpoints, planned
+up front from --seed so two runs issue the same sequence; compare two reports
+with `python -m bench.report`. Needs httpx (for its ASGI transport).
+"""
+import argparse
+import asyncio
+import os
+import random
+import time
+
+# Local stand-ins must be selected before app.config is imported
+os.environ.setdefault("MONGO_BACKEND", "memory")
+os.environ.setdefault("LLM_BACKEND", "fake")
+
+import httpx
+from bench.report import summarize, write_report
+
+DEFAULT_MIX = "login=5,profile_get=20,profile_post=5,watchlist_get=20,watchlist_post=5,predict_stock=25,chat=20"
+PROFILE = {
+    "full_name": "Bench User",
+    "email": "",
+    "location": "Pune",
+    "occupation": "Engineer",
+    "risk_tolerance": "moderate",
+    "investment_horizon": "long",
+    "monthly_investment": 500.0,
+    "preferred_sectors": ["tech", "energy"],
+    "investment_goals": ["retirement"],
+}
+SYMBOLS = ["AAPL", "MSFT", "GOOG", "AMZN", "TSLA", "NVDA", "META", "KO"]
+CHAT_PROMPTS = [
+    "Is {} stock a buy right now?",
+    "What is the dividend yield of {} shares?",
+    "How volatile is {} stock this year?",
+    "Should I hold {} stock for the long term?",
+]
+
+
+def parse_mix(spec):
+    mix = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        mix[name.strip()] = float(weight)
+    unknown = set(mix) - set(OPERATIONS)
+    if unknown:
+        raise SystemExit(f"❌ Unknown operations in --mix: {', '.join(sorted(unknown))}")
+    return mix
+
+
+def plan(mix, requests, users, seed):
+    rng = random.Random(seed)
+    names = list(mix)
+    ops = rng.choices(names, weights=[mix[n] for n in names], k=requests)
+    return [(op, rng.randrange(users), rng.random()) for op in ops]
+
+
+class Session:
+    def __init__(self, client, email, password):
+        self.client = client
+        self.email = email
+        self.password = password
+        self.headers = {}
+
+    async def login(self):
+        response = await self.client.post("/login", data={"username": self.email, "password": self.password})
+        if response.status_code == 200:
+            self.headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        return response
+
+
+async def op_login(session, client, r, ctx):
+    return await session.login()
+
+
+async def op_profile_get(session, client, r, ctx):
+    return await client.get("/profile", headers=session.headers)
+
+
+async def op_profile_post(session, client, r, ctx):
+    return await client.post("/profile", json={**PROFILE, "email": session.email}, headers=session.headers)
+
+
+async def op_watchlist_get(session, client, r, ctx):
+    return await client.get("/watchlist", headers=session.headers)
+
+
+async def op_watchlist_post(session, client, r, ctx):
+    return await client.post("/watchlist", json={"symbols": [SYMBOLS[int(r * len(SYMBOLS))]]},
+                             headers=session.headers)
+
+
+async def op_predict_stock(session, client, r, ctx):
+    # Pick among a small pool of as-of dates so the forecast cache sees both hits and misses
+    as_of = ctx["as_of_dates"][int(r * len(ctx["as_of_dates"]))]
+    return await client.post("/predict_stock", json={"symbol": ctx["symbol"], "as_of": as_of})
+
+
+async def op_chat(session, client, r, ctx):
+    prompt = ctx["chat_prompts"][int(r * len(ctx["chat_prompts"]))]
+    return await client.post("/chat", json=prompt, headers=session.headers)
+
+
+OPERATIONS = {
+    "login": op_login,
+    "profile_get": op_profile_get,
+    "profile_post": op_profile_post,
+    "watchlist_get": op_watchlist_get,
+    "watchlist_post": op_watchlist_post,
+    "predict_stock": op_predict_stock,
+    "chat": op_chat,
+}
+
+
+async def seed_sessions(client, users):
+    sessions = []
+    for i in range(users):
+        session = Session(client, f"bench{i}@load.test", "bench-password")
+        await client.post("/signup", params={"email": session.email, "password": session.password})
+        response = await session.login()
+        if response.status_code != 200:
+            raise SystemExit(f"❌ Could not log in seeded user {session.email}: {response.text}")
+        # Give every user a document so reads exercise real projections
+        await client.post("/profile", json={**PROFILE, "email": session.email}, headers=session.headers)
+        await client.post("/watchlist", json={"symbols": SYMBOLS[:3]}, headers=session.headers)
+        sessions.append(session)
+    return sessions
+
+
+async def run(args):
+    from main import app, market_store, n_days
+    from app import config
+
+    mix = parse_mix(args.mix)
+    dates = market_store.snapshot().date_strings
+    rng = random.Random(args.seed)
+    ctx = {
+        "symbol": config.MARKET_DATA_SYMBOL,
+        "as_of_dates": rng.sample(dates[-args.as_of_pool - 60:], args.as_of_pool) if args.as_of_pool else [None],
+        "chat_prompts": [p.format(s) for p in CHAT_PROMPTS for s in SYMBOLS][:args.chat_prompts],
+    }
+
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            print(f"⚠️ Seeding {args.users} users (bcrypt makes this slow)...")
+            sessions = await seed_sessions(client, args.users)
+
+            # Warm-up requests are excluded from the results
+            for op, user, r in plan(mix, args.warmup, args.users, args.seed + 1):
+                await OPERATIONS[op](sessions[user], client, r, ctx)
+
+            latencies = {op: [] for op in mix}
+            errors = {op: 0 for op in mix}
+            all_latencies = []
+            queue = asyncio.Queue()
+            for item in plan(mix, args.requests, args.users, args.seed):
+                queue.put_nowait(item)
+
+            async def worker():
+                while not queue.empty():
+                    op, user, r = queue.get_nowait()
+                    started = time.perf_counter()
+                    try:
+                        response = await OPERATIONS[op](sessions[user], client, r, ctx)
+                        failed = response.status_code >= 400
+                    except Exception:
+                        failed = True
+                    elapsed = time.perf_counter() - started
+                    latencies[op].append(elapsed)
+                    all_latencies.append(elapsed)
+                    errors[op] += failed
+
+            print(f"⚠️ Running {args.requests} requests at concurrency {args.concurrency}...")
+            started = time.perf_counter()
+            await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+            elapsed = time.perf_counter() - started
+
+            results = {f"load.{op}": summarize(latencies[op], errors[op], elapsed) for op in mix}
+            results["load.total"] = summarize(all_latencies, sum(errors.values()), elapsed)
+            server = {
+                "inference": (await client.get("/inference/stats")).json(),
+                "chat_cache": (await client.get("/chat/stats")).json(),
+            }
+
+    params = {**vars(args), "horizon": n_days, "mongo_backend": config.MONGO_BACKEND,
+              "llm_backend": config.LLM_BACKEND, "inference_backend": config.INFERENCE_BACKEND,
+              "inference_executor": config.INFERENCE_EXECUTOR, "batching": bool(config.INFERENCE_BATCHING)}
+    # Server-side counters (cache hit ratios, batch sizes) help explain a latency change
+    write_report(args.output, "load", params, results, extra={"server": server})
+    total = results["load.total"]
+    print(f"✅ {total['count']} requests, {total['errors']} errors, {total['throughput_rps']:.1f} req/s, "
+          f"p50 {total['p50_ms']:.1f} ms, p99 {total['p99_ms']:.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=100)
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"weighted operations (default: {DEFAULT_MIX})")
+    parser.add_argument("--as-of-pool", type=int, default=20,
+                        help="distinct as-of dates for /predict_stock (0 = latest only)")
+    parser.add_argument("--chat-prompts", type=int, default=16, help="distinct /chat prompts")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Latency/memory benchmark for the keras and numpy LSTM backends.
+
+Run from server/:  python -m bench.lstm_backends [--batch-sizes 1 64] [--repeats 50]
+
+Each backend is measured in its own subprocess so import time and peak RSS are
+not polluted by the other framework. Parity between the two is checked by
+tests/test_lstm_backends.py.
+"""
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import time
+import numpy as np
+
+def sample_windows(count, seed=0):
+    import joblib
+    from app import config
+    from app.market.store import MarketDataStore
+    from app.ml.models import SCALER_PATH
+    from app.ml.rollout import FEATURE_COLUMNS, SEQUENCE_LENGTH
+
+    snapshot = MarketDataStore(config.MARKET_DATA_PATH).snapshot()
+    scaler = joblib.load(SCALER_PATH)
+    rng = np.random.default_rng(seed)
+    ends = rng.integers(SEQUENCE_LENGTH, len(snapshot) + 1, size=count)
+    matrix = np.column_stack([snapshot.columns[name] for name in FEATURE_COLUMNS]).astype(np.float64)
+    return np.stack([scaler.transform(matrix[end - SEQUENCE_LENGTH:end]) for end in ends]).astype(np.float32)
+
+
+def measure(backend, batch_sizes, repeats):
+    from app.ml.models import load_feature_extractor
+
+    started = time.perf_counter()
+    feature_fn = load_feature_extractor(backend)
+    load_s = time.perf_counter() - started
+
+    latency = {}
+    for batch_size in batch_sizes:
+        windows = sample_windows(batch_size)
+        feature_fn(windows)  # warm-up / tracing
+        started = time.perf_counter()
+        for _ in range(repeats):
+            feature_fn(windows)
+        latency[batch_size] = 1000 * (time.perf_counter() - started) / repeats
+
+    return {
+        "backend": backend,
+        "load_s": round(load_s, 3),
+        # ru_maxrss is KiB on Linux
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "latency_ms": {str(k): round(v, 3) for k, v in latency.items()},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 64])
+    parser.add_argument("--repeats", type=int, default=50)
+    parser.add_argument("--measure", choices=["keras", "numpy"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        print(json.dumps(measure(args.measure, args.batch_sizes, args.repeats)))
+        return
+
+    report = {"backends": []}
+    for backend in ("keras", "numpy"):
+        out = subprocess.run(
+            [sys.executable, "-m", "bench.lstm_backends", "--measure", backend,
+             "--repeats", str(args.repeats), "--batch-sizes", *map(str, args.batch_sizes)],
+            check=True, capture_output=True, text=True,
+        ).stdout
+        report["backends"].append(json.loads(out.strip().splitlines()[-1]))
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Isolated micro-benchmarks for the forecast rollout and the /chat prompt validator.
+
+Run from server/:  python -m bench.micro [--backend numpy] [--repeats 50] [--output micro.json]
+
+Each benchmark times one function on fixed inputs, outside the web stack, and
+reports per-call latency percentiles plus calls per second in the same report
+layout as bench.load, so `python -m bench.report` can diff either kind.
+"""
+import argparse
+import time
+import numpy as np
+from app import config
+from app.chat.validator import validate_batch, validate_input
+from app.market.store import MarketDataStore
+from app.ml.rollout import FEATURE_COLUMNS, HORIZON, SEQUENCE_LENGTH
+from bench.report import summarize, write_report
+from bench.validator import CORPUS, fuzz_corpus
+
+
+def timed(fn, repeats, warmup=3):
+    for _ in range(warmup):
+        fn()
+    latencies = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        latencies.append(time.perf_counter() - started)
+    summary = summarize(latencies)
+    summary["ops_per_s"] = repeats / sum(latencies)
+    return summary
+
+
+def rollout_benchmarks(backend, repeats, batch_size):
+    from app.ml.models import load_rollout_engine
+
+    engine = load_rollout_engine(backend)
+    snapshot = MarketDataStore(config.MARKET_DATA_PATH).snapshot()
+    matrix = np.column_stack([snapshot.columns[c] for c in FEATURE_COLUMNS]).astype(np.float64)
+    raw = matrix[-SEQUENCE_LENGTH:]
+    scaled = engine.scale(raw)
+    starts = np.linspace(0, len(matrix) - SEQUENCE_LENGTH, batch_size).astype(int)
+    batch = np.stack([engine.scale(matrix[s:s + SEQUENCE_LENGTH]) for s in starts])
+
+    results = {
+        "rollout.scale": timed(lambda: engine.scale(raw), repeats * 10),
+        "rollout.step": timed(lambda: engine.predict_batch(scaled[np.newaxis]), repeats * 10),
+        "rollout.forecast": timed(lambda: engine.forecast_scaled(scaled, HORIZON), repeats),
+        f"rollout.forecast_batch{batch_size}": timed(lambda: engine.forecast_batch(batch, HORIZON), max(repeats // 10, 3)),
+    }
+    # Per-window cost of the batched rollout, comparable with rollout.forecast
+    results[f"rollout.forecast_batch{batch_size}"]["per_window_ms"] = (
+        results[f"rollout.forecast_batch{batch_size}"]["mean_ms"] / batch_size
+    )
+    return results
+
+
+def validator_benchmarks(repeats):
+    prompts = CORPUS + fuzz_corpus(1000)
+    results = {
+        "validate_input.single": timed(lambda: [validate_input(p) for p in prompts], repeats),
+        "validate_input.batch": timed(lambda: validate_batch(prompts), repeats),
+    }
+    # Each call above covers the whole corpus; also report the cost of one prompt
+    for summary in results.values():
+        summary["per_prompt_us"] = summary["mean_ms"] * 1000 / len(prompts)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backend", choices=["keras", "numpy"], default=config.INFERENCE_BACKEND)
+    parser.add_argument("--repeats", type=int, default=50)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--only", choices=["rollout", "validator"], help="run one group only")
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    results = {}
+    if args.only in (None, "validator"):
+        results.update(validator_benchmarks(args.repeats))
+    if args.only in (None, "rollout"):
+        results.update(rollout_benchmarks(args.backend, args.repeats, args.batch_size))
+    write_report(args.output, "micro", vars(args), results)
+
+
+if __name__ == "__main__":
+    main()
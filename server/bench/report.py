@@ -0,0 +1,104 @@
+"""Machine-readable benchmark reports and a diff between two runs.
+
+Run from server/:  python -m bench.report BASELINE.json CANDIDATE.json [--threshold 10]
+
+bench.load and bench.micro both write the same layout: a "meta" block describing
+the run and a flat {benchmark name: {metric: value}} "results" map, so any two
+reports (even of different kinds) can be compared metric by metric.
+"""
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+import numpy as np
+
+# Metrics where a larger value is an improvement; everything else is a latency or error count
+HIGHER_IS_BETTER = {"throughput_rps", "ops_per_s"}
+
+
+def summarize(latencies_s, errors=0, elapsed_s=None):
+    """p50/p90/p99/mean/max in milliseconds for one series of latencies."""
+    ms = np.asarray(latencies_s, dtype=np.float64) * 1000
+    summary = {"count": int(ms.size), "errors": int(errors)}
+    if ms.size:
+        p50, p90, p99 = np.percentile(ms, [50, 90, 99])
+        summary.update(p50_ms=float(p50), p90_ms=float(p90), p99_ms=float(p99),
+                       mean_ms=float(ms.mean()), max_ms=float(ms.max()))
+    if elapsed_s:
+        summary["throughput_rps"] = ms.size / elapsed_s
+    return summary
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def write_report(path, kind, params, results, extra=None):
+    report = {
+        "meta": {
+            "kind": kind,
+            "git": git_revision(),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "params": params,
+        },
+        "results": results,
+        **(extra or {}),
+    }
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if path:
+        with open(path, "w") as f:
+            f.write(text + "\n")
+        print(f"✅ Report written to {path}")
+    else:
+        print(text)
+    return report
+
+
+def diff(baseline, candidate, threshold):
+    """Yield (benchmark, metric, old, new, change %, regressed) for every metric in both reports."""
+    for name in sorted(set(baseline["results"]) & set(candidate["results"])):
+        old_metrics, new_metrics = baseline["results"][name], candidate["results"][name]
+        for metric in sorted(set(old_metrics) & set(new_metrics)):
+            old, new = old_metrics[metric], new_metrics[metric]
+            if not isinstance(old, (int, float)) or not isinstance(new, (int, float)) or metric == "count":
+                continue
+            change = (new - old) / old * 100 if old else (0.0 if new == old else float("inf"))
+            worse = -change if metric in HIGHER_IS_BETTER else change
+            yield name, metric, old, new, change, worse > threshold
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two benchmark reports.")
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--threshold", type=float, default=10.0,
+                        help="percent change counted as a regression (default: 10)")
+    args = parser.parse_args()
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.candidate) as f:
+        candidate = json.load(f)
+
+    regressions = 0
+    print(f"{'benchmark':<32} {'metric':<16} {'baseline':>12} {'candidate':>12} {'change':>9}")
+    for name, metric, old, new, change, regressed in diff(baseline, candidate, args.threshold):
+        regressions += regressed
+        flag = " ❌" if regressed else ""
+        print(f"{name:<32} {metric:<16} {old:>12.3f} {new:>12.3f} {change:>+8.1f}%{flag}")
+    if regressions:
+        print(f"❌ {regressions} metric(s) regressed by more than {args.threshold}%")
+        sys.exit(1)
+    print("✅ No regressions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Serialization benchmark for /predict_stock and /graph payloads.
+
+Run from server/:  python -m bench.serialization [--repeats 2000] [--output ser.json]
+
+Times FastAPI's default path (jsonable_encoder + json.dumps of the row-oriented
+body) against each negotiated format in app.core.encoding, for the default 60
+day history / 30 day horizon and a larger history, and reports body sizes raw
+and compressed. orjson, msgpack and brotli are used when installed.
+"""
+import argparse
+import gzip
+import json
+import time
+import numpy as np
+from fastapi.encoders import jsonable_encoder
+from app.core import encoding
+from bench.report import summarize, write_report
+
+
+def payloads(history, horizon, seed=0):
+    rng = np.random.default_rng(seed)
+    dates = np.datetime_as_string(np.datetime64("2020-01-01") + np.arange(history), unit="D").tolist()
+    closes = 100 + rng.standard_normal(history).cumsum()
+    predictions = closes[-1] + rng.standard_normal(horizon).cumsum()
+    timesteps = [f"Day {i+1}" for i in range(horizon)]
+    columnar = {
+        "previous": {"date": dates, "close": closes},
+        "predictions": predictions,
+        "horizon": horizon,
+        "status": "success",
+    }
+    legacy = {
+        "previous": [{"date": d, "close": c} for d, c in zip(dates, closes.tolist())],
+        "predictions": predictions.tolist(),
+        "timesteps": timesteps,
+        "status": "success",
+    }
+    return columnar, legacy
+
+
+def encoders(columnar, legacy):
+    yield "fastapi_default", lambda: json.dumps(jsonable_encoder(legacy)).encode()
+    yield "json", lambda: encoding.dumps(legacy)
+    yield "columnar", lambda: encoding.dumps(columnar)
+    if encoding.msgpack is not None:
+        yield "msgpack", lambda: encoding.msgpack.packb(encoding._plain(columnar))
+    yield "float32", lambda: encoding.pack_float32(columnar)
+
+
+def measure(fn, repeats):
+    latencies = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        latencies.append(time.perf_counter() - started)
+    summary = summarize(latencies)
+    summary["ops_per_s"] = repeats / sum(latencies)
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeats", type=int, default=2000)
+    parser.add_argument("--sizes", nargs="+", default=["60x30", "1000x365"],
+                        help="history x horizon combinations (default: 60x30 1000x365)")
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    results = {}
+    for size in args.sizes:
+        history, horizon = (int(n) for n in size.split("x"))
+        columnar, legacy = payloads(history, horizon)
+        for name, fn in encoders(columnar, legacy):
+            summary = measure(fn, args.repeats)
+            body = fn()
+            summary["bytes"] = len(body)
+            summary["gzip_bytes"] = len(gzip.compress(body, compresslevel=5))
+            if encoding.brotli is not None:
+                summary["br_bytes"] = len(encoding.brotli.compress(body, quality=4))
+            results[f"serialize.{size}.{name}"] = summary
+            print(f"{size:>9} {name:<16} {summary['mean_ms'] * 1000:>9.1f} us {summary['bytes']:>8} B "
+                  f"{summary['gzip_bytes']:>8} B gz")
+
+    params = {**vars(args), "orjson": encoding.orjson is not None, "msgpack": encoding.msgpack is not None,
+              "brotli": encoding.brotli is not None}
+    write_report(args.output, "serialization", params, results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+"""Parity check and micro-benchmark for the /chat prompt validator.
+
+Run from server/:  python -m bench.validator [--repeats 2000]
+
+Compares app.chat.validator against the original per-request implementation
+(kept below as legacy_validate_input) on a corpus of prompts: decisions must be
+identical, then both are timed per prompt and in batch.
+"""
+import argparse
+import random
+import re
+import sys
+import time
+from app.chat.validator import validate_batch, validator
+
+CORPUS = [
+    "Is AAPL stock a buy right now?",
+    "is aapl stock a buy",
+    "What is the dividend yield of KO shares?",
+    "Compare NYSE and NASDAQ listed tech stocks",
+    "Should I buy Tesla?",
+    "Best crypto stocks for 2024",
+    "NFT share prices",
+    "personal stock advice please",
+    "hypothetical: if I bought MSFT stock in 1990",
+    "def buy_stock(): pass",
+    "stock class action lawsuits",
+    "import stock data",
+    "stock price if(x > 3)",
+    "stock while (true)",
+    "stock for (i=0;i<3;i++)",
+    "try { stock } catch (e)",
+    "#include <stock.h>",
+    "public static stock",
+    "System.out.println(stock)",
+    "<script>alert('stock')</script>",
+    "stock {json}",
+    "stock [list]",
+    "stock (parenthetical remark)",
+    "stock a == b",
+    "stock a -> b",
+    "stock -- comment",
+    "stock || true",
+    "stock; drop table",
+    "select best stock",
+    "stock updates today",
+    "stock OR 1=1",
+    "stock AND x=y",
+    "<b>stock</b>",
+    "stock ${jndi:ldap}",
+    "stock news at https://www.reuters.com/markets",
+    "stock news at https://example.com",
+    "stock tips on www.bloomberg.com",
+    "stock tips on www.randomsite.com",
+    "yahoo finance stock quote http://finance.yahoo.com",
+    "SHARE price of INFY on NASDAQ",
+    "Stock" * 50,
+    "stock " + "x" * 194,
+    "stock " + "x" * 195,
+    "",
+    "   ",
+    "shareholder letters from Berkshire",
+    "Dividend aristocrats list",
+    "What's the P/E ratio of GOOG stock?",
+    "Moneycontrol says Reliance shares rose",
+    "letter to stock holders",  # \blet\b must not fire on 'letter'
+    "stock const",
+    "stock var",
+    "stock function",
+    "console.log stock",
+    "investopedia definition of stock split",
+    "HTTP stock api",
+    "deleted stock",
+    "stock <= 5",
+    "stock :: namespace",
+    "stöck ünicode share",
+    "K stock",  # Kelvin sign lower-cases to 'k'
+]
+
+
+# Fragments for randomized parity prompts: rule triggers, near-misses and case-folding oddities
+FUZZ_TOKENS = [
+    "stock", "share", "NYSE", "def", "class", "letter", "or", "OR", "and", "=", "==", "(", ")", "{", "}",
+    "[", "]", "<", ">", "-", "--", ";", "|", "#include", "$", "${x}", "http", "www.", "reuters", "crypto",
+    "\u017f", "\u212a", "\u0130", " ", "select", "Update", "x", "1", "yahoo finance", "console.log",
+    "System.out.println", "try", "catch", "if", "while", "for", "<script>", "::", "->", "!=", "\n", "\u00e9",
+]
+
+
+def fuzz_corpus(count, seed=0):
+    rng = random.Random(seed)
+    return [
+        "".join(rng.choice(FUZZ_TOKENS) + rng.choice(["", " "]) for _ in range(rng.randint(0, 25)))
+        for _ in range(count)
+    ]
+
+
+def legacy_validate_input(query: str) -> bool:
+    # Length check
+    if len(query) > 200:
+        return False
+
+    # Keyword denylist
+    prohibited_terms = ["crypto", "nft", "personal", "hypothetical"]
+    if any(term in query.lower() for term in prohibited_terms):
+        return False
+
+    # Stock-specific allowlist
+    stock_keywords = ["stock", "share", "nyse", "nasdaq", "dividend"]
+    if not any(kw in query.lower() for kw in stock_keywords):
+        return False
+
+    # Programming syntax blocklist (Python, JS, C/C++, Java, etc.)
+    programming_patterns = [
+        r"\bdef\b", r"\bclass\b", r"\bimport\b", r"\bfunction\b", r"\bconsole\.log\b",
+        r"\bvar\b", r"\blet\b", r"\bconst\b", r"\bif\s*\(", r"\bwhile\s*\(",
+        r"\bfor\s*\(", r"try\s*{", r"catch\s*\(", r"#include\s*<", r"\bpublic\b",
+        r"\bprivate\b", r"\bstatic\b", r"\bSystem\.out\.println\b", r"<script.*?>",
+        r"{.*?}", r"\[.*?\]", r"\(.*?\)", r"==|!=|>=|<=|=>|<-|->|::",  # common logic/syntax
+    ]
+    for pattern in programming_patterns:
+        if re.search(pattern, query, re.IGNORECASE):
+            return False
+
+    # Injection/XSS patterns
+    injection_patterns = [
+        r"(?:--|\|\||;)",  # SQL chaining
+        r"(?:select|drop|insert|delete|update|union)",  # SQL keywords
+        r"(?:\bOR\b|\bAND\b).+=.",  # conditional logic
+        r"<[^>]+>",  # HTML tags
+        r"(?:\$\{.+\})",  # Template injections
+    ]
+    for pattern in injection_patterns:
+        if re.search(pattern, query, re.IGNORECASE):
+            return False
+
+    # Block external links that are NOT stock/company/news related
+    if "http" in query.lower() or "www." in query.lower():
+        allowed_domains = ["bloomberg", "reuters", "yahoo finance", "marketwatch", "moneycontrol", "investopedia"]
+        if not any(domain in query.lower() for domain in allowed_domains):
+            return False
+
+    return True
+
+
+def timed(fn, prompts, repeats):
+    started = time.perf_counter()
+    for _ in range(repeats):
+        for prompt in prompts:
+            fn(prompt)
+    return 1e6 * (time.perf_counter() - started) / (repeats * len(prompts))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeats", type=int, default=2000)
+    parser.add_argument("--fuzz", type=int, default=20000, help="extra randomized prompts for the parity check")
+    args = parser.parse_args()
+
+    mismatches = []
+    for prompt in CORPUS + fuzz_corpus(args.fuzz):
+        result = validator.validate(prompt)
+        if result.ok != legacy_validate_input(prompt):
+            mismatches.append((prompt, result))
+    checked = len(CORPUS) + args.fuzz
+    print(f"parity: {checked - len(mismatches)}/{checked} prompts agree")
+    for prompt, result in mismatches:
+        print(f"  MISMATCH {prompt!r}: new={result}")
+
+    legacy_us = timed(legacy_validate_input, CORPUS, args.repeats)
+    new_us = timed(lambda p: validator.validate(p), CORPUS, args.repeats)
+    started = time.perf_counter()
+    for _ in range(args.repeats):
+        validate_batch(CORPUS)
+    batch_us = 1e6 * (time.perf_counter() - started) / (args.repeats * len(CORPUS))
+    print(f"legacy: {legacy_us:8.2f} us/prompt")
+    print(f"   new: {new_us:8.2f} us/prompt  ({legacy_us / new_us:.1f}x)")
+    print(f" batch: {batch_us:8.2f} us/prompt")
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
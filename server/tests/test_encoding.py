@@ -0,0 +1,90 @@
+"""Encodes a warm-started (memmap-backed) market snapshot in every negotiated format.
+
+Run from server/:  python -m pytest tests
+"""
+import csv
+import json
+import os
+import shutil
+import struct
+import numpy as np
+import pytest
+
+pytest.importorskip("fastapi")
+from starlette.requests import Request
+from app.core import encoding
+from app.market.downsample import SeriesPyramids
+from app.market.store import COLUMN_DTYPES, MarketDataStore, MarketSnapshot
+
+DATASET = os.path.join(os.path.dirname(__file__), "..", "data", "latest_dataset.csv")
+
+
+@pytest.fixture
+def memmap_snapshot(tmp_path):
+    """Snapshot loaded back from the binary column store, as after a restart."""
+    path = str(tmp_path / "dataset.csv")
+    shutil.copy(DATASET, path)
+    with open(path, newline="") as f:
+        rows = list(csv.DictReader(f))
+    dates = np.array([row["Date"][:10] for row in rows], dtype="datetime64[D]")
+    columns = {name: np.array([float(row[name]) for row in rows]).astype(dtype) for name, dtype in COLUMN_DTYPES.items()}
+    store = MarketDataStore(path)
+    store._write_binary(MarketSnapshot(dates, columns, store._csv_signature()))
+
+    snapshot = MarketDataStore(path).snapshot()
+    assert isinstance(snapshot.columns["Close"], np.memmap)
+    return snapshot
+
+
+def request(fmt):
+    return Request({"type": "http", "query_string": f"format={fmt}".encode(), "headers": []})
+
+
+def payloads(snapshot, max_points=None):
+    start, end = snapshot.history_range(120)
+    dates, closes = SeriesPyramids().downsample(snapshot, "Close", start, end, max_points)
+    predictions = snapshot.columns["Open"][-30:]
+    columnar = {"previous": {"date": dates, "close": closes}, "predictions": predictions, "status": "success"}
+    legacy = {
+        "previous": [{"date": d, "close": c} for d, c in zip(dates, closes.tolist())],
+        "predictions": predictions.tolist(),
+        "status": "success",
+    }
+    return columnar, (lambda: legacy), list(dates), np.asarray(closes)
+
+
+def unpack_float32(body):
+    (length,) = struct.unpack_from("<I", body)
+    header = json.loads(body[4:4 + length])
+    arrays, offset = {}, 4 + length
+    for spec in header["arrays"]:
+        dtype = np.dtype(spec["dtype"])
+        arrays[spec["name"]] = np.frombuffer(body, dtype=dtype, count=spec["length"], offset=offset)
+        offset += dtype.itemsize * spec["length"]
+    return arrays
+
+
+@pytest.mark.parametrize("max_points", [None, 40])
+@pytest.mark.parametrize("fmt", sorted(encoding.FORMATS))
+def test_memmap_snapshot_encodes(memmap_snapshot, fmt, max_points):
+    if fmt == "msgpack" and encoding.msgpack is None:
+        pytest.skip("msgpack is not installed")
+    columnar, legacy, dates, closes = payloads(memmap_snapshot, max_points)
+    body = encoding.encode(request(fmt), columnar, legacy).body
+
+    if fmt == "json":
+        decoded = json.loads(body)
+        assert [row["date"] for row in decoded["previous"]] == dates
+        np.testing.assert_array_equal([row["close"] for row in decoded["previous"]], closes)
+    elif fmt == "columnar":
+        decoded = json.loads(body)
+        assert decoded["previous"]["date"] == dates
+        np.testing.assert_array_equal(decoded["previous"]["close"], closes)
+    elif fmt == "msgpack":
+        decoded = encoding.msgpack.unpackb(body)
+        assert decoded["previous"]["date"] == dates
+        np.testing.assert_array_equal(decoded["previous"]["close"], closes)
+    else:
+        arrays = unpack_float32(body)
+        assert np.datetime_as_string(arrays["previous.date"].astype("datetime64[D]")).tolist() == dates
+        np.testing.assert_allclose(arrays["previous.close"], closes, rtol=1e-6)
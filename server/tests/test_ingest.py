@@ -0,0 +1,63 @@
+"""Replays data/latest_dataset.csv through the ingest sentiment rules.
+
+Run from server/:  python -m pytest tests
+"""
+import csv
+import os
+import numpy as np
+import pytest
+from app.market.ingest import derive_sentiment, parse_rows, scale_sentiment
+from app.market.store import MarketSnapshot
+
+DATASET = os.path.join(os.path.dirname(__file__), "..", "data", "latest_dataset.csv")
+# No-news rows whose score comes from news on a weekend or holiday, which the CSV does not record
+UNRECORDED_NEWS_ROWS = 33
+
+
+def load_dataset():
+    with open(DATASET, newline="") as f:
+        rows = list(csv.DictReader(f))
+    dates = np.array([row["Date"][:10] for row in rows], dtype="datetime64[D]")
+    columns = {
+        name: np.array([float(row[name]) for row in rows])
+        for name in ("Sentiment_gpt", "News_flag", "Scaled_sentiment")
+    }
+    return dates, columns
+
+
+def test_scaled_sentiment_matches_dataset():
+    _, columns = load_dataset()
+    np.testing.assert_allclose(scale_sentiment(columns["Sentiment_gpt"]), columns["Scaled_sentiment"], atol=1e-12)
+
+
+def test_decay_reproduces_no_news_rows():
+    dates, columns = load_dataset()
+    mismatches = []
+    for i in np.flatnonzero(columns["News_flag"] < 0.5)[1:]:
+        # Ingest only reads the last stored row, so a one-row snapshot stands in for rows[:i]
+        stored = MarketSnapshot(dates[i - 1:i], {"Sentiment_gpt": columns["Sentiment_gpt"][i - 1:i]}, None)
+        incoming = {"Sentiment_gpt": np.array([np.nan]), "News_flag": np.array([0.0])}
+        derived = derive_sentiment(stored, dates[i:i + 1], incoming)
+        if abs(derived["Sentiment_gpt"][0] - columns["Sentiment_gpt"][i]) > 1e-9:
+            mismatches.append(i)
+
+    assert len(mismatches) == UNRECORDED_NEWS_ROWS
+    # Only the first trading day after a gap can hide a news day
+    assert all(dates[i] - dates[i - 1] > np.timedelta64(1, "D") for i in mismatches)
+
+
+def test_decay_chains_within_a_batch():
+    dates, columns = load_dataset()
+    # 2016-10-17 is a news day followed by five days without news, across a weekend
+    start = int(np.searchsorted(dates, np.datetime64("2016-10-17")))
+    stored = MarketSnapshot(dates[start:start + 1], {"Sentiment_gpt": columns["Sentiment_gpt"][start:start + 1]}, None)
+    incoming = {"Sentiment_gpt": np.full(5, np.nan), "News_flag": np.zeros(5)}
+    derived = derive_sentiment(stored, dates[start + 1:start + 6], incoming)
+    np.testing.assert_allclose(derived["Sentiment_gpt"], columns["Sentiment_gpt"][start + 1:start + 6], atol=1e-9)
+
+
+@pytest.mark.parametrize("rows", [[[1, 2]], ["x"], [{"Date": "2024-01-18", "Open": [1]}], [{"Date": "nope"}]])
+def test_malformed_rows_are_value_errors(rows):
+    # The API and CLI turn ValueError into a 400 / an error message
+    with pytest.raises(ValueError, match="row 1"):
+        parse_rows(rows)
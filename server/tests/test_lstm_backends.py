@@ -0,0 +1,37 @@
+"""Parity between the keras and numpy LSTM feature backends on real dataset windows.
+
+Run from server/:  python -m pytest tests   (skipped when TensorFlow is not installed)
+Latency and memory are measured separately by `python -m bench.lstm_backends`.
+"""
+import csv
+import os
+import numpy as np
+import pytest
+
+pytest.importorskip("tensorflow")
+pytest.importorskip("h5py")
+joblib = pytest.importorskip("joblib")
+from app.ml.models import SCALER_PATH, load_feature_extractor
+from app.ml.rollout import FEATURE_COLUMNS, SEQUENCE_LENGTH
+
+SERVER_DIR = os.path.join(os.path.dirname(__file__), "..")
+# Largest |keras - numpy| difference tolerated per feature
+PARITY_ATOL = 1e-4
+
+
+@pytest.fixture
+def windows(monkeypatch):
+    # Model paths are relative to server/
+    monkeypatch.chdir(SERVER_DIR)
+    with open("data/latest_dataset.csv", newline="") as f:
+        matrix = np.array([[float(row[name]) for name in FEATURE_COLUMNS] for row in csv.DictReader(f)])
+    scaler = joblib.load(SCALER_PATH)
+    ends = np.random.default_rng(1).integers(SEQUENCE_LENGTH, len(matrix) + 1, size=256)
+    return np.stack([scaler.transform(matrix[end - SEQUENCE_LENGTH:end]) for end in ends]).astype(np.float32)
+
+
+def test_numpy_features_match_keras(windows):
+    expected = np.asarray(load_feature_extractor("keras")(windows))
+    actual = np.asarray(load_feature_extractor("numpy")(windows))
+    assert actual.shape == expected.shape
+    np.testing.assert_allclose(actual, expected, rtol=0, atol=PARITY_ATOL)
@@ -0,0 +1,42 @@
+"""Readiness semantics of StartupReport.
+
+Run from server/:  python -m pytest tests
+"""
+import asyncio
+import pytest
+from app.core.startup import StartupReport
+
+REQUIRED = ("models", "market_data")
+SETTLED = ("warmup",)
+
+
+async def load_all(report, warm_up):
+    for name in REQUIRED + SETTLED:
+        report.register(name)
+    await report.load("models", lambda: "engine")
+    await report.load("market_data", lambda: "snapshot")
+    assert not report.is_ready(REQUIRED, SETTLED)  # warm-up still pending
+    try:
+        await report.load("warmup", warm_up)
+    except RuntimeError:
+        pass
+
+
+def test_failed_warmup_is_not_fatal():
+    async def warm_up():
+        raise RuntimeError("forecast exploded")
+
+    report = StartupReport()
+    asyncio.run(load_all(report, warm_up))
+    assert report.is_ready(REQUIRED, SETTLED)
+    assert report.failed() == {"warmup": "forecast exploded"}
+
+
+@pytest.mark.parametrize("failing", REQUIRED)
+def test_failed_required_component_is_not_ready(failing):
+    report = StartupReport()
+    for name in REQUIRED:
+        report.record(name, "failed" if name == failing else "ready", error="boom" if name == failing else None)
+    report.record("warmup", "ready")
+    assert not report.is_ready(REQUIRED, SETTLED)
+    assert failing in report.failed()